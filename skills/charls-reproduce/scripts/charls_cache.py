@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+CHARLS 数据列式缓存加载器 (.dta / .sas7bdat / .xpt / .csv → Arrow Feather)
+
+每个复现脚本、每次 agent 重试都从 `pd.read_stata('charls.dta')` 开始, 整个
+harmonized 文件 (~10 万行, 所有波次堆叠) 每次都要重新解析几十秒, 且加载全部列。
+本模块把源文件只转换一次, 存为未压缩的 Arrow IPC (Feather v2) 文件:
+  - 缓存按源文件内容 sha256 区分; 源文件 (size, mtime) 不变时不重新计算哈希
+  - 加载时内存映射读取, 只读取请求的列 (columns)
+  - wave / 行过滤条件下推到 Arrow 扫描, 不会先物化整表再筛选
+  - Stata 值标签转换得到的分类变量 (中文标签) 原样保留为 pandas Categorical
+
+用法:
+    import sys; sys.path.insert(0, "skills/charls-reproduce/scripts")
+    from charls_cache import load_charls, charls_columns
+
+    charls_columns("charls.dta")                       # 只读 schema, 用于变量探索
+
+    w1 = load_charls(
+        "charls.dta",
+        columns=["ID", "wave", "age", "imrc", "dlrc", "ser7", "orient", "draw"],
+        waves=1,                                       # 或 "wave1" / [1, 3]
+        filters=[("age", ">=", 50)],
+    )
+
+    df = load_charls("charls.dta")                     # 全部列, 首次调用完成转换
+
+命令行:
+    python3 charls_cache.py charls.dta                 # 转换 (或确认缓存有效) 并打印概况
+    python3 charls_cache.py charls.dta --columns ID wave age --waves 1 3
+    python3 charls_cache.py --list
+    python3 charls_cache.py --clear
+
+filters 与 pandas.read_parquet 相同: [(列, 操作符, 值), ...] 表示 AND,
+[[...], [...]] 表示 OR; 操作符: == != < <= > >= in "not in"。
+分类列按标签比较, 如 ("ragender", "==", "男性")。
+
+注意:
+  - 返回的 DataFrame 使用新的 RangeIndex (不保留源文件行号), 行顺序与源文件一致
+  - read_kwargs 变化 (如 convert_categoricals=False) 会生成独立的缓存
+  - 依赖 pandas 和 pyarrow (pip install pyarrow)
+
+环境变量:
+    CHARLS_CACHE_DIR   缓存目录 (默认 ~/.cache/medgeclaw/charls)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+CACHE_DIR = Path(os.environ.get("CHARLS_CACHE_DIR") or Path.home() / ".cache" / "medgeclaw" / "charls")
+INDEX_NAME = "index.json"
+CACHE_VERSION = 1  # 转换逻辑变化时递增, 使旧缓存失效
+HASH_CHUNK = 4 * 1024 * 1024
+
+READERS = {
+    ".dta": pd.read_stata,
+    ".sas7bdat": pd.read_sas,
+    ".xpt": pd.read_sas,
+    ".csv": pd.read_csv,
+}
+
+_MMAP_FS = pafs.LocalFileSystem(use_mmap=True)
+
+
+# ─── 缓存索引 ──────────────────────────────────────────────────────────
+
+
+def _load_index() -> dict:
+    try:
+        return json.loads((CACHE_DIR / INDEX_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index: dict) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_DIR / f".{INDEX_NAME}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1))
+    os.replace(tmp, CACHE_DIR / INDEX_NAME)
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_hash(path, index: dict | None = None) -> str:
+    """源文件 sha256; (size, mtime) 与索引记录一致时直接复用, 不重新读取文件"""
+    path = Path(path).resolve()
+    st = path.stat()
+    entry = (index if index is not None else _load_index()).get(str(path))
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha256"]
+    return _sha256(path)
+
+
+def _cache_name(path: Path, digest: str, read_kwargs: dict) -> str:
+    opts = json.dumps({"v": CACHE_VERSION, **read_kwargs}, sort_keys=True, default=str)
+    opts_hash = hashlib.sha256(opts.encode()).hexdigest()[:8]
+    return f"{path.stem}-{digest[:16]}-{opts_hash}.feather"
+
+
+def _record(path: Path, digest: str, cache_name: str) -> None:
+    """记录源文件的 (size, mtime, sha256) 与缓存文件; 源文件内容变化后的旧缓存删除"""
+    st = path.stat()
+    index = _load_index()  # 转换期间其他进程可能已更新索引
+    caches = []
+    for name in index.get(str(path), {}).get("caches", []):
+        if name == cache_name:
+            continue
+        if f"-{digest[:16]}-" in name:
+            caches.append(name)  # 同一内容、不同 read_kwargs 的缓存保留
+        else:
+            (CACHE_DIR / name).unlink(missing_ok=True)
+    caches.append(cache_name)
+    index[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "caches": caches}
+    _save_index(index)
+
+
+# ─── 转换 ──────────────────────────────────────────────────────────────
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """DataFrame → Arrow; 类型混杂无法转换的 object 列按字符串保存"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                print(f"⚠️  列 {col} 类型混杂, 缓存中按字符串保存", file=sys.stderr)
+                df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def convert(source, read_kwargs: dict | None = None, force: bool = False, verbose: bool = True) -> Path:
+    """
+    确保 source 的列式缓存存在并返回其路径。
+
+    缓存有效 (同一源文件内容 + 同一 read_kwargs) 时只做一次 stat, 否则用
+    pandas 读取源文件并写入 Feather; 同一源路径的旧缓存文件会被删除。
+    """
+    path = Path(source).resolve()
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"不支持的文件类型 '{path.suffix}', 可选: {sorted(READERS)}")
+    read_kwargs = dict(read_kwargs or {})
+
+    index = _load_index()
+    digest = source_hash(path, index)
+    target = CACHE_DIR / _cache_name(path, digest, read_kwargs)
+    if target.exists() and not force:
+        entry = index.get(str(path), {})
+        st = path.stat()
+        if (entry.get("size"), entry.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+            _record(path, digest, target.name)  # 内容未变但 mtime 变了: 更新记录, 下次免哈希
+        return target
+
+    t0 = time.perf_counter()
+    df = reader(path, **read_kwargs)
+    t1 = time.perf_counter()
+    table = _to_arrow(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"charls_cache": json.dumps({"source": str(path), "sha256": digest, "read_kwargs": read_kwargs},
+                                    ensure_ascii=False, default=str).encode(),
+    })
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    # 未压缩: 加载时可直接内存映射, 无需解压
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, target)
+
+    _record(path, digest, target.name)
+
+    if verbose:
+        print(f"📦 {path.name}: {table.num_rows} 行 × {table.num_columns} 列, "
+              f"读取 {t1 - t0:.1f}s + 写缓存 {time.perf_counter() - t1:.1f}s → {target}")
+    return target
+
+
+# ─── 加载 ──────────────────────────────────────────────────────────────
+
+
+def _dataset(source, read_kwargs: dict | None = None) -> ds.Dataset:
+    return ds.dataset(str(convert(source, read_kwargs)), format="ipc", filesystem=_MMAP_FS)
+
+
+def _wave_values(waves, field: pa.Field) -> list:
+    """1 / "1" / "wave1" 统一成 wave 列的实际取值"""
+    if not isinstance(waves, (list, tuple, set)):
+        waves = [waves]
+    value_type = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+    if pa.types.is_integer(value_type) or pa.types.is_floating(value_type):
+        return [int(str(w).lower().removeprefix("wave")) for w in waves]
+    return [w if str(w).lower().startswith("wave") else f"wave{w}" for w in waves]
+
+
+def _expression(filters, waves, wave_col: str, schema: pa.Schema):
+    expr = pq.filters_to_expression(filters) if filters else None
+    if waves is not None:
+        if wave_col not in schema.names:
+            raise KeyError(f"数据中没有 wave 列 '{wave_col}', 请用 wave_col 指定")
+        wave_expr = ds.field(wave_col).isin(_wave_values(waves, schema.field(wave_col)))
+        expr = wave_expr if expr is None else expr & wave_expr
+    return expr
+
+
+def load_charls(
+    source,
+    columns: list[str] | None = None,
+    waves=None,
+    filters=None,
+    wave_col: str = "wave",
+    read_kwargs: dict | None = None,
+    as_arrow: bool = False,
+):
+    """
+    从列式缓存加载 CHARLS 数据 (首次调用时自动转换)。
+
+    Args:
+        source: .dta / .sas7bdat / .xpt / .csv 路径
+        columns: 只读取这些列 (None = 全部); 过滤用到的列无需包含在内
+        waves: 只保留这些波次, 如 1 / "wave1" / [1, 3]
+        filters: 行过滤, 格式同 pandas.read_parquet (见模块文档)
+        wave_col: 波次列名 (harmonized 数据为 "wave")
+        read_kwargs: 首次转换时传给 pandas 读取函数的参数 (参与缓存键)
+        as_arrow: 返回 pyarrow.Table 而不是 DataFrame
+
+    Returns:
+        DataFrame (分类列为 Categorical, 类别与顺序同源文件) 或 pyarrow.Table
+    """
+    dataset = _dataset(source, read_kwargs)
+    if columns is not None:
+        missing = [c for c in columns if c not in dataset.schema.names]
+        if missing:
+            raise KeyError(f"缓存中没有这些列: {missing}")
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=_expression(filters, waves, wave_col, dataset.schema),
+    )
+    if as_arrow:
+        return table
+    # pandas metadata 中记录了 Categorical 的 ordered 等信息, to_pandas 据此还原
+    return table.to_pandas()
+
+
+def charls_columns(source, read_kwargs: dict | None = None) -> pd.DataFrame:
+    """只读取 schema: 列名与类型 (分类列标注为 category), 不加载数据"""
+    schema = _dataset(source, read_kwargs).schema
+    return pd.DataFrame({
+        "column": schema.names,
+        "type": ["category" if pa.types.is_dictionary(f.type) else str(f.type) for f in schema],
+    })
+
+
+def list_cache() -> list[dict]:
+    """已缓存的源文件: 路径、sha256、缓存文件与大小"""
+    out = []
+    for src, entry in _load_index().items():
+        for name in entry.get("caches", []):
+            f = CACHE_DIR / name
+            if f.exists():
+                out.append({"source": src, "sha256": entry["sha256"], "cache": str(f), "bytes": f.stat().st_size})
+    return out
+
+
+def clear_cache() -> None:
+    for f in CACHE_DIR.glob("*.feather"):
+        f.unlink(missing_ok=True)
+    (CACHE_DIR / INDEX_NAME).unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CHARLS 数据列式缓存: 转换并按列/波次加载")
+    parser.add_argument("source", nargs="?", help=".dta / .sas7bdat / .xpt / .csv 文件")
+    parser.add_argument("--columns", nargs="+", help="只加载这些列")
+    parser.add_argument("--waves", nargs="+", help="只加载这些波次, 如 1 3 或 wave1")
+    parser.add_argument("--wave-col", default="wave")
+    parser.add_argument("--force", action="store_true", help="忽略已有缓存, 重新转换")
+    parser.add_argument("--list", action="store_true", help="列出已缓存的文件")
+    parser.add_argument("--clear", action="store_true", help="清空缓存")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+        print(f"🧹 已清空 {CACHE_DIR}")
+    if args.list:
+        for e in list_cache():
+            print(f"  {e['source']}  {e['sha256'][:12]}  {e['bytes'] / 1024 / 1024:.1f} MB  {e['cache']}")
+    if not args.source:
+        if not (args.clear or args.list):
+            parser.error("需要源文件路径")
+        return
+
+    convert(args.source, force=args.force)
+    t0 = time.perf_counter()
+    df = load_charls(args.source, columns=args.columns, waves=args.waves, wave_col=args.wave_col)
+    elapsed = time.perf_counter() - t0
+    n_cat = sum(isinstance(dt, pd.CategoricalDtype) for dt in df.dtypes)
+    print(f"✅ 加载 {len(df)} 行 × {df.shape[1]} 列 ({n_cat} 个分类列), 耗时 {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
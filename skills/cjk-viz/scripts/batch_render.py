@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+多进程批量渲染 matplotlib 图 (预热 CJK 字体)
+
+分析步骤常常连续产出几十张图, 每张都要付出字体初始化和高 dpi savefig 的单核开销。
+本模块把图的生成分发到进程池: 每个 worker 启动时只执行一次 setup_cjk_font(),
+字体查找结果在 worker 内复用, 之后的每张图不再重复检测。
+
+用法:
+    from batch_render import render_figures
+    from setup_cjk_font import get_cjk_fp
+
+    def volcano(df_path, title):          # 必须是模块级函数 (可 pickle)
+        fp = get_cjk_fp()                 # 字体路径已在 worker 启动时解析
+        fig, ax = plt.subplots()
+        ...
+        ax.set_title(title, fontproperties=fp)
+        return fig                        # 返回 Figure → 由 worker 保存并关闭
+
+    results = render_figures([
+        {"func": volcano, "args": ("de.csv", "火山图"), "out": "/tmp/volcano.png"},
+        {"func": heatmap, "kwargs": {"top": 50}, "out": "/tmp/heatmap.png", "dpi": 200},
+        make_umap,                        # 裸 callable: 自行保存, 返回值原样带回
+    ], dpi=300)
+
+    for r in results:                     # 与输入顺序一致
+        print(r["index"], r["out"], f"{r['seconds']:.2f}s", r["error"])
+
+spec 字段:
+    func     (必填) 生成图的 callable, 返回 Figure 或任意可 pickle 的值
+    args     位置参数 (tuple)
+    kwargs   关键字参数 (dict)
+    out      输出路径; func 返回 Figure 时必填
+    dpi      覆盖 render_figures 的默认 dpi
+    savefig  其他传给 fig.savefig 的参数 (dict)
+"""
+
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from setup_cjk_font import setup_cjk_font
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+
+def _init_worker(candidates: list[str] | None, extra_paths: list[str] | None) -> None:
+    """进程池 initializer: 每个 worker 只检测并配置一次字体"""
+    setup_cjk_font(candidates=candidates, extra_paths=extra_paths)
+
+
+def _normalize(spec) -> dict:
+    """把裸 callable 统一成 spec dict"""
+    if callable(spec):
+        return {"func": spec}
+    if not isinstance(spec, dict) or not callable(spec.get("func")):
+        raise TypeError(f"spec 必须是 callable 或含 'func' 的 dict, 得到: {spec!r}")
+    return spec
+
+
+def _render_one(job: tuple[int, dict, int, dict]) -> dict:
+    """在 worker 中渲染单张图, 返回带计时的结果 dict (异常不会向外抛出)"""
+    index, spec, default_dpi, default_savefig = job
+    out = spec.get("out")
+    result = {
+        "index": index,
+        "out": out,
+        "result": None,
+        "render_seconds": 0.0,
+        "save_seconds": 0.0,
+        "seconds": 0.0,
+        "error": None,
+    }
+    t0 = time.perf_counter()
+    fig = None
+    try:
+        value = spec["func"](*spec.get("args", ()), **spec.get("kwargs", {}))
+        t1 = time.perf_counter()
+        result["render_seconds"] = t1 - t0
+
+        if isinstance(value, Figure):
+            fig = value
+            if not out:
+                raise ValueError("func 返回了 Figure, 但 spec 未指定 'out'")
+            os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+            savefig = {"bbox_inches": "tight", **default_savefig, **spec.get("savefig", {})}
+            fig.savefig(out, dpi=spec.get("dpi", default_dpi), **savefig)
+            result["save_seconds"] = time.perf_counter() - t1
+        else:
+            result["result"] = value
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+    finally:
+        if fig is not None:
+            plt.close(fig)
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def render_figures(
+    specs: list,
+    max_workers: int | None = None,
+    dpi: int = 300,
+    savefig: dict | None = None,
+    candidates: list[str] | None = None,
+    extra_paths: list[str] | None = None,
+    verbose: bool = False,
+) -> list[dict]:
+    """
+    在进程池中批量渲染图, 结果按输入顺序返回。
+
+    Args:
+        specs: callable 或 spec dict 列表 (见模块文档); func 必须是模块级函数,
+               lambda / 闭包无法跨进程传递
+        max_workers: 进程数, 默认 os.cpu_count(); 为 1 或只有一张图时在当前进程渲染
+        dpi: 默认 savefig dpi
+        savefig: 所有图共用的 savefig 参数 (spec 中的同名参数优先)
+        candidates / extra_paths: 透传给每个 worker 的 setup_cjk_font()
+        verbose: 打印每张图的耗时
+
+    Returns:
+        每张图一个 dict: index, out, result, render_seconds, save_seconds,
+        seconds, error (失败时为带 traceback 的字符串, 其余图照常渲染)
+    """
+    jobs = [(i, _normalize(s), dpi, savefig or {}) for i, s in enumerate(specs)]
+    if not jobs:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    t0 = time.perf_counter()
+    if workers <= 1:
+        _init_worker(candidates, extra_paths)
+        results = [_render_one(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(candidates, extra_paths),
+        ) as pool:
+            results = list(pool.map(_render_one, jobs))
+    elapsed = time.perf_counter() - t0
+
+    failed = [r for r in results if r["error"]]
+    if verbose:
+        for r in results:
+            status = "❌" if r["error"] else "✅"
+            print(f"{status} [{r['index']}] {r['out'] or '-'} "
+                  f"render={r['render_seconds']:.2f}s save={r['save_seconds']:.2f}s")
+        print(f"🖼️  {len(results)} 张图, {workers} 个进程, 总耗时 {elapsed:.2f}s")
+    for r in failed:
+        print(f"⚠️  第 {r['index']} 张图渲染失败: {r['error'].splitlines()[0]}", file=sys.stderr)
+    return results
@@ -221,6 +221,7 @@ def get_cjk_fp() -> FontProperties:
 
     用于 matplotlib 文本元素的 fontproperties= 参数。
     对 .ttc 文件这是唯一可靠的渲染方式；对 .ttf 也兼容。
+    每次调用返回新对象 (字体路径已由 setup_cjk_font() 解析), 字号等属性取当前 rcParams。
 
     用法:
         CJK_FP = get_cjk_fp()
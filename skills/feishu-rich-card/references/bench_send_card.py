@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for send_card.py against mock_feishu_server.py.
+
+Sends the same multi-image card repeatedly under several sender
+configurations and reports cards/s, p50/p99 send latency, and image bytes
+before optimization, after optimization and on the wire.
+Needs no credentials or network: the mock runs in-process on 127.0.0.1, and
+images and caches go to a temporary directory removed on exit.
+
+Usage:
+  python3 bench_send_card.py                                  # defaults
+  python3 bench_send_card.py --cards 30 --images 6 --latency 80 --jitter 40
+  python3 bench_send_card.py --rate-limit 0.05 --fail-rate 0.01 --json
+  python3 bench_send_card.py --configs serial concurrent cached
+"""
+
+import argparse
+import json
+import os
+import math
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+# Isolate every cache send_card.py keeps; must be set before it is imported
+_TMP = tempfile.mkdtemp(prefix="feishu-bench-")
+os.environ["FEISHU_CACHE_DIR"] = os.path.join(_TMP, "cache")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import send_card  # noqa: E402
+from mock_feishu_server import start_mock_server  # noqa: E402
+
+# name -> FeishuCardSender kwargs
+CONFIGS = {
+    # one upload at a time, files sent as-is, nothing cached (pre-optimization behaviour)
+    "serial": {"upload_workers": 1, "image_cache": False, "image_format": "raw"},
+    "concurrent": {"upload_workers": 4, "image_cache": False, "image_format": "raw"},
+    "optimized": {"upload_workers": 4, "image_cache": False, "image_format": "auto"},
+    "cached": {"upload_workers": 4, "image_cache": True, "image_format": "auto"},
+}
+
+
+def make_png(path: Path, width: int, height: int, seed: int):
+    """
+    Write a figure-like RGB PNG using only the standard library: antialiased
+    line series over a light grid on the left, a smooth heatmap on the right.
+
+    Encoded like a plotting library's output (no row filters, zlib level 6),
+    so downscaling and re-encoding shrink it the way they shrink real
+    300 dpi figures.
+    """
+    rng = random.Random(seed)
+    split = width * 3 // 5
+    top, bottom = height // 10, height - height // 10
+    # Fine-grained colormap: a coarse one makes the heatmap unrealistically compressible
+    cmap = [
+        bytes((int(68 + 185 * z), int(30 + 700 * z * (1 - z)) % 256, int(84 + 80 * (1 - z))))
+        for z in (i / 4095 for i in range(4096))
+    ]
+    fx, fy, phase = rng.uniform(2, 5), rng.uniform(2, 5), rng.uniform(0, 6.3)
+    heat_x = [math.sin(fx * math.pi * x / (width - split) + phase) for x in range(width - split)]
+
+    curves = [(rng.uniform(0, 6.3), rng.uniform(0.15, 0.35), color)
+              for color in ((31, 119, 180), (255, 127, 14), (44, 160, 44))]
+    marks = {}  # y -> [(x, pixel)] for the curve strokes
+    for x in range(split):
+        for ph, amp, color in curves:
+            cy = top + (bottom - top) * (0.5 + amp * math.sin(6 * x / split + ph))
+            for y in range(int(cy) - 4, int(cy) + 6):
+                d = abs(y - cy)
+                if d < 5:
+                    k = 1.0 if d < 3 else (5 - d) / 2  # 2px antialiased edge
+                    marks.setdefault(y, []).append((x, bytes(int(255 - (255 - c) * k) for c in color)))
+
+    white, grid = b"\xff" * (split * 3), b"\xe6" * (split * 3)
+    rows = []
+    for y in range(height):
+        left = bytearray(grid if y % 120 < 2 and top <= y < bottom else white)
+        for x, pixel in marks.get(y, ()):
+            left[x * 3:x * 3 + 3] = pixel
+        cv = math.cos(fy * math.pi * y / height)
+        right = b"".join(cmap[int(2047.5 + 2047 * h * cv)] for h in heat_x)
+        rows.append(b"\x00" + bytes(left) + right)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(b"".join(rows), 6))
+        + chunk(b"IEND", b"")
+    )
+    path.write_bytes(png)
+
+
+class PayloadMeter:
+    """
+    Wraps send_card._cached_optimize to count the image bytes actually handed
+    to the upload request (after optimization), as opposed to raw request
+    bytes, which also include multipart framing, JSON bodies and retries.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+        self._inner = send_card._cached_optimize
+        send_card._cached_optimize = self
+
+    def reset(self):
+        self.source_bytes = 0
+        self.payload_bytes = 0
+
+    def __call__(self, content: bytes, *args, **kwargs):
+        out, fmt = self._inner(content, *args, **kwargs)
+        with self.lock:
+            self.source_bytes += len(content)
+            self.payload_bytes += len(out)
+        return out, fmt
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[k]
+
+
+def run_config(name: str, base: str, server, meter: PayloadMeter, images: list[str], cards: int, chat_id: str) -> dict:
+    """Send `cards` identical cards with one sender configuration."""
+    # Fresh optimized-image / image_key caches per config, so "cached" starts as cold as the others
+    send_card.CACHE_DIR = Path(_TMP) / "cache" / name
+    creds = {"app_id": f"cli_bench_{name}", "app_secret": "x", "api_base": base}
+    sender = send_card.FeishuCardSender(creds=creds, **CONFIGS[name])
+    elements = []
+    for i, path in enumerate(images):
+        elements.append({"type": "markdown", "content": f"**Figure {i + 1}**"})
+        elements.append({"type": "image", "path": path, "alt": f"fig {i + 1}"})
+
+    server.reset_stats()
+    meter.reset()
+    latencies, errors = [], 0
+    t0 = time.perf_counter()
+    for _ in range(cards):
+        t = time.perf_counter()
+        try:
+            sender.send_rich_card(chat_id, f"Bench {name}", elements)
+            latencies.append(time.perf_counter() - t)
+        except Exception as e:
+            errors += 1
+            print(f"  [{name}] send failed: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    sender.close()
+
+    stats = server.stats
+    return {
+        "config": name,
+        "cards": cards,
+        "errors": errors,
+        "seconds": elapsed,
+        "cards_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        # The first card pays one-off work (re-encoding, cold caches); report it apart
+        "first_ms": latencies[0] * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies[1:], 50) * 1000,
+        "p99_ms": percentile(latencies[1:], 99) * 1000,
+        "source_bytes": meter.source_bytes,
+        "payload_bytes": meter.payload_bytes,
+        "request_bytes": stats["bytes_received"],
+        "image_uploads": stats["requests"].get("image", 0),
+        "rate_limited": stats["rate_limited"],
+        "server_errors": stats["failed"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark send_card.py against the offline mock API")
+    parser.add_argument("--cards", type=int, default=20, help="Cards sent per configuration")
+    parser.add_argument("--images", type=int, default=6, help="Images per card")
+    parser.add_argument("--width", type=int, default=2400, help="Generated image width (px)")
+    parser.add_argument("--height", type=int, default=1200, help="Generated image height (px)")
+    parser.add_argument("--latency", type=float, default=50.0, help="Mock latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=30.0, help="Mock extra random latency (ms)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        results, total_kb = run(args)
+    finally:
+        shutil.rmtree(_TMP, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    mb = 1024 * 1024
+    print(f"\n  {args.cards} cards × {args.images} images ({total_kb:.0f} KB/card), "
+          f"mock latency {args.latency:.0f}+{args.jitter:.0f} ms\n")
+    print(f"  {'config':<12}{'cards/s':>9}{'first ms':>10}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'source':>10}{'payload':>10}{'request':>10}{'uploads':>9}{'errors':>8}")
+    for r in results:
+        print(f"  {r['config']:<12}{r['cards_per_s']:>9.2f}{r['first_ms']:>10.0f}{r['p50_ms']:>9.0f}{r['p99_ms']:>9.0f}"
+              f"{r['source_bytes'] / mb:>8.1f}MB{r['payload_bytes'] / mb:>8.1f}MB{r['request_bytes'] / mb:>8.1f}MB"
+              f"{r['image_uploads']:>9}{r['errors']:>8}")
+    print("\n  first: latency of the first card · p50/p99: remaining cards\n"
+          "  source: image files as read · payload: image bytes after optimization · "
+          "request: all request bodies incl. retries\n")
+
+
+def run(args) -> tuple[list[dict], float]:
+    img_dir = Path(_TMP) / "images"
+    img_dir.mkdir()
+    images = []
+    for i in range(args.images):
+        path = img_dir / f"fig{i}.png"
+        make_png(path, args.width, args.height, seed=args.seed + i)
+        images.append(str(path))
+    total_kb = sum(os.path.getsize(p) for p in images) / 1024
+
+    server, base = start_mock_server(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        rate_limit=args.rate_limit,
+        fail_rate=args.fail_rate,
+        retry_after=0.05,
+        seed=args.seed,
+    )
+    if send_card.Image is None and "optimized" in args.configs:
+        print("Note: Pillow not installed, 'optimized' uploads files unchanged", file=sys.stderr)
+
+    meter = PayloadMeter()
+    results = []
+    try:
+        for name in args.configs:
+            results.append(run_config(name, base, server, meter, images, args.cards, "oc_bench"))
+    finally:
+        server.shutdown()
+    return results, total_kb
+
+
+if __name__ == "__main__":
+    main()
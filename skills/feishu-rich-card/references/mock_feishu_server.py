@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Offline Feishu Open API stand-in for exercising send_card.py without credentials.
+
+Implements the endpoints send_card.py uses, under /open-apis:
+  POST  /auth/v3/tenant_access_token/internal
+  POST  /im/v1/images
+  POST  /im/v1/messages?receive_id_type=chat_id
+  POST  /im/v1/messages/{message_id}/reply
+  PATCH /im/v1/messages/{message_id}
+  GET   /stats           (request counts, bytes received; not a Feishu API)
+
+Faults can be injected: fixed latency plus jitter, rate-limit responses
+(HTTP 429 + code 99991400 + Retry-After) and server errors (HTTP 500).
+
+Usage:
+  python3 mock_feishu_server.py --port 7790 --latency 80 --rate-limit 0.05
+  FEISHU_API_BASE=http://127.0.0.1:7790/open-apis python3 send_card.py ...
+
+Or in-process:
+  from mock_feishu_server import start_mock_server
+  server, base = start_mock_server(latency_ms=50)
+  sender = FeishuCardSender(creds={"app_id": "cli_mock", "app_secret": "x", "api_base": base})
+  ...
+  server.shutdown()
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+PREFIX = "/open-apis"
+
+
+class MockFeishuServer(http.server.ThreadingHTTPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(
+        self,
+        addr,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit: float = 0.0,
+        fail_rate: float = 0.0,
+        retry_after: float = 0.2,
+        token_expire: int = 7200,
+        seed: int | None = None,
+    ):
+        super().__init__(addr, MockFeishuHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.token_expire = token_expire
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {
+                "requests": {},
+                "bytes_received": 0,
+                "image_bytes": 0,
+                "rate_limited": 0,
+                "failed": 0,
+                "messages": {},  # message_id -> {"chat_id", "updates"}
+            }
+
+    def record(self, endpoint: str, nbytes: int):
+        with self.lock:
+            self.stats["requests"][endpoint] = self.stats["requests"].get(endpoint, 0) + 1
+            self.stats["bytes_received"] += nbytes
+
+    def roll_fault(self) -> str | None:
+        """Decide (thread-safely) whether this request is rate limited or fails."""
+        with self.lock:
+            r = self.rng.random()
+            if r < self.rate_limit:
+                self.stats["rate_limited"] += 1
+                return "rate_limit"
+            if r < self.rate_limit + self.fail_rate:
+                self.stats["failed"] += 1
+                return "fail"
+            return None
+
+    def delay(self):
+        with self.lock:
+            ms = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+
+class MockFeishuHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server: MockFeishuServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, body: dict, status: int = 200, headers: dict | None = None):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization", "").startswith("Bearer t-mock-"):
+            return True
+        self._send_json({"code": 99991663, "msg": "Invalid access token"}, 400)
+        return False
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            with self.server.lock:
+                body = json.loads(json.dumps(self.server.stats))
+            body["messages"] = len(body["messages"])
+            self._send_json(body)
+        else:
+            self._send_json({"code": 404, "msg": "not found"}, 404)
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def _handle(self, method: str):
+        path = urlparse(self.path).path
+        body = self._read_body()
+        if not path.startswith(PREFIX):
+            self._send_json({"code": 404, "msg": "not found"}, 404)
+            return
+        route = path[len(PREFIX):]
+        parts = route.strip("/").split("/")
+
+        if method == "POST" and route == "/auth/v3/tenant_access_token/internal":
+            endpoint = "token"
+        elif method == "POST" and route == "/im/v1/images":
+            endpoint = "image"
+        elif method == "POST" and route == "/im/v1/messages":
+            endpoint = "send"
+        elif method == "POST" and len(parts) == 5 and parts[:3] == ["im", "v1", "messages"] and parts[4] == "reply":
+            endpoint = "reply"
+        elif method == "PATCH" and len(parts) == 4 and parts[:3] == ["im", "v1", "messages"]:
+            endpoint = "update"
+        else:
+            self._send_json({"code": 404, "msg": f"no mock for {method} {route}"}, 404)
+            return
+
+        self.server.record(endpoint, len(body))
+        self.server.delay()
+        fault = self.server.roll_fault()
+        if fault == "rate_limit":
+            self._send_json(
+                {"code": 99991400, "msg": "request trigger frequency limit"},
+                429,
+                {"Retry-After": str(self.server.retry_after)},
+            )
+            return
+        if fault == "fail":
+            self._send_json({"code": 500, "msg": "mock internal error"}, 500)
+            return
+
+        if endpoint == "token":
+            data = json.loads(body or b"{}")
+            self._send_json({
+                "code": 0,
+                "msg": "ok",
+                "tenant_access_token": f"t-mock-{data.get('app_id', '')}-{uuid.uuid4().hex[:8]}",
+                "expire": self.server.token_expire,
+            })
+            return
+        if not self._authorized():
+            return
+
+        if endpoint == "image":
+            with self.server.lock:
+                self.server.stats["image_bytes"] += len(body)
+            key = "img_v3_mock_" + hashlib.sha256(body).hexdigest()[:16]
+            self._send_json({"code": 0, "msg": "success", "data": {"image_key": key}})
+        elif endpoint in ("send", "reply"):
+            data = json.loads(body or b"{}")
+            message_id = "om_mock_" + uuid.uuid4().hex[:16]
+            chat_id = data.get("receive_id") or parts[3]
+            with self.server.lock:
+                self.server.stats["messages"][message_id] = {"chat_id": chat_id, "updates": 0}
+            self._send_json({"code": 0, "msg": "success", "data": {"message_id": message_id, "chat_id": chat_id}})
+        elif endpoint == "update":
+            with self.server.lock:
+                msg = self.server.stats["messages"].get(parts[3])
+                if msg:
+                    msg["updates"] += 1
+            if msg is None:
+                self._send_json({"code": 230001, "msg": "message not found"}, 400)
+            else:
+                self._send_json({"code": 0, "msg": "success", "data": {}})
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, **options) -> tuple[MockFeishuServer, str]:
+    """Start the mock in a daemon thread. Returns (server, api_base)."""
+    server = MockFeishuServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{PREFIX}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Feishu API mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7790)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, 0..N ms")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for fault injection")
+    args = parser.parse_args()
+
+    server = MockFeishuServer(
+        (args.host, args.port),
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        rate_limit=args.rate_limit,
+        fail_rate=args.fail_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"\n  Mock Feishu API → http://{args.host}:{server.server_address[1]}{PREFIX}", flush=True)
+    print(f"  export FEISHU_API_BASE=http://{args.host}:{server.server_address[1]}{PREFIX}\n", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n  Mock server stopped.")
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
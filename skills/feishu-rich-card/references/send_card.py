@@ -11,25 +11,101 @@ Or standalone:
     python3 send_card.py --chat oc_xxx --title "Report" --image /tmp/plot.png --text "Done!"
 """
 
+import asyncio
+import hashlib
+import io
 import json
 import os
+import sqlite3
 import sys
+import tempfile
+import threading
+import time
+import uuid
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked (best-effort) token file
+    fcntl = None
+
+try:
+    from PIL import Image
+except ImportError:  # optional: without Pillow images are uploaded as-is
+    Image = None
+
 # ─── Config ──────────────────────────────────────────────────────────────
 
 OPENCLAW_CONFIG = Path.home() / ".openclaw" / "openclaw.json"
 DEFAULT_CHAT_ID = os.environ.get("FEISHU_DEFAULT_CHAT_ID", "")
 
+# (connect, read) seconds
+REQUEST_TIMEOUT = (5, 30)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+POOL_MAXSIZE = 16
+UPLOAD_WORKERS = 4
+
+CACHE_DIR = Path(os.environ.get("FEISHU_CACHE_DIR", Path.home() / ".cache" / "medgeclaw" / "feishu"))
+IMAGE_CACHE_TTL = 30 * 24 * 3600
+IMAGE_CACHE_MAX_ENTRIES = 5000
+
+# Pre-upload optimization. Cards display images at most ~1200px wide, so
+# 300 dpi figures and 2400px SVG renders are downscaled before upload.
+IMAGE_MAX_WIDTH = int(os.environ.get("FEISHU_IMAGE_MAX_WIDTH", "1600"))
+IMAGE_FORMAT = os.environ.get("FEISHU_IMAGE_FORMAT", "auto")  # auto / png / jpeg / webp / raw
+IMAGE_QUALITY = 85
+OPTIMIZED_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# .svg image elements are rasterized in one batch by svg-ui-templates/scripts/rasterize.py
+SVG_SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "svg-ui-templates" / "scripts"
+
+# Minimum seconds between in-place updates of one live card
+# (Feishu allows ~5 edits/s per message; progress cards rarely need more than this)
+LIVE_MIN_INTERVAL = 3.0
+
+# Broadcast pacing. Feishu's message-send limit is 50 req/s per app (and
+# 5 req/s per chat); stay well under it by default.
+BROADCAST_RATE = 20.0
+BROADCAST_BURST = 10
+BROADCAST_CONCURRENCY = 8
+
+# Feishu business codes that mean "slow down and retry"
+# 99991400: app-level frequency limit, 230020: message send frequency limit
+RATE_LIMIT_CODES = {99991400, 230020}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Token rejected (invalid / expired / revoked): drop the cached token and retry once
+INVALID_TOKEN_CODES = {99991663, 99991668}
+# Message deleted / recalled / no longer editable: a live card starts over with a new message
+MESSAGE_GONE_CODES = {230001, 230011}
+
 # ─── Token Cache ─────────────────────────────────────────────────────────
 
 _token_cache: dict = {}
+_creds_cache: dict = {}
+
+TOKEN_CACHE_PATH = CACHE_DIR / "tokens.json"
+TOKEN_REFRESH_MARGIN = 60
 
 
 def _get_credentials() -> dict:
-    """Read Feishu appId/appSecret from openclaw.json."""
+    """Read Feishu appId/appSecret from openclaw.json (memoized by file mtime)."""
+    st = os.stat(OPENCLAW_CONFIG)
+    stamp = (str(OPENCLAW_CONFIG), st.st_mtime_ns, st.st_size)
+    if _creds_cache.get("stamp") == stamp:
+        return dict(_creds_cache["creds"])
+    creds = _read_credentials()
+    _creds_cache.update(stamp=stamp, creds=creds)
+    return dict(creds)
+
+
+def _read_credentials() -> dict:
     with open(OPENCLAW_CONFIG) as f:
         cfg = json.load(f)
     feishu = cfg.get("channels", {}).get("feishu", {})
@@ -49,94 +125,706 @@ def _get_credentials() -> dict:
     }
 
 
-def _api_base(domain: str = "feishu") -> str:
+def _default_api_base(domain: str = "feishu") -> str:
     if domain == "lark":
         return "https://open.larksuite.com/open-apis"
     return "https://open.feishu.cn/open-apis"
 
 
-def _get_token(creds: dict) -> str:
-    """Get or refresh tenant access token."""
-    import time
+def _api_base(domain: str = "feishu", api_base: Optional[str] = None) -> str:
+    """API root; api_base (or FEISHU_API_BASE) overrides it, e.g. for the offline mock server."""
+    base = api_base or os.environ.get("FEISHU_API_BASE")
+    if base:
+        return base.rstrip("/")
+    return _default_api_base(domain)
+
+
+def _new_session() -> requests.Session:
+    """Keep-alive session with a connection pool sized for concurrent uploads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_delay(attempt: int, resp: Optional[requests.Response] = None) -> float:
+    """Server-provided wait (Retry-After / x-ogw-ratelimit-reset) or exponential backoff."""
+    if resp is not None:
+        for header in ("Retry-After", "x-ogw-ratelimit-reset"):
+            value = resp.headers.get(header)
+            if value:
+                try:
+                    return min(max(float(value), 0.0), BACKOFF_MAX)
+                except ValueError:
+                    pass
+    return min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX)
+
+
+def _request_json(
+    session: requests.Session,
+    method: str,
+    url: str,
+    timeout=REQUEST_TIMEOUT,
+    max_retries: int = MAX_RETRIES,
+    **kwargs,
+) -> dict:
+    """
+    Send a request and return the decoded JSON body.
+
+    Connection errors, timeouts, HTTP 429/5xx and Feishu rate-limit codes are
+    retried up to max_retries times with bounded exponential backoff.
+    Request bodies must be replayable (bytes, not open file objects).
+    """
+    for attempt in range(max_retries + 1):
+        resp = None
+        try:
+            resp = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= max_retries:
+                raise
+        else:
+            try:
+                data = resp.json()
+            except ValueError:
+                data = {"code": -1, "msg": f"HTTP {resp.status_code}: {resp.text[:200]}"}
+            retryable = resp.status_code in RETRY_STATUS or data.get("code") in RATE_LIMIT_CODES
+            if not retryable or attempt >= max_retries:
+                return data
+        time.sleep(_retry_delay(attempt, resp))
+    raise AssertionError("unreachable")
+
+
+def _load_token_file() -> dict:
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_token_file(tokens: dict):
+    """Atomic, owner-only write so readers never see a partial file."""
+    now = time.time()
+    tokens = {k: v for k, v in tokens.items() if v.get("expires_at", 0) > now}
+    tmp = TOKEN_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(tokens, f)
+    os.replace(tmp, TOKEN_CACHE_PATH)
+
+
+@contextmanager
+def _token_file_lock():
+    """Exclusive cross-process lock guarding token refresh (released on close)."""
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        lock = open(TOKEN_CACHE_PATH.with_suffix(".lock"), "a")
+    except OSError as e:
+        print(f"Warning: token cache lock unavailable ({e})", file=sys.stderr)
+        yield
+        return
+    with lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
 
-    cache_key = creds["app_id"]
+def _valid(entry: Optional[dict]) -> bool:
+    return bool(entry) and entry.get("expires_at", 0) > time.time() + TOKEN_REFRESH_MARGIN
+
+
+def _cache_scope(creds: dict) -> str:
+    """
+    Key for everything cached per app: app_id, or app_id@<api root> when the
+    API root is not the default one. Tokens, image_keys and live-card state
+    from another root (e.g. the mock server) must never leak into real sends.
+    """
+    domain = creds.get("domain", "feishu")
+    base = _api_base(domain, creds.get("api_base"))
+    if base == _default_api_base(domain):
+        return creds["app_id"]
+    return f"{creds['app_id']}@{base}"
+
+
+def _get_token(creds: dict, session: Optional[requests.Session] = None) -> str:
+    """
+    Get or refresh tenant access token.
+
+    Lookup order: in-process dict, then the shared on-disk cache, then the API.
+    The refresh happens under an exclusive file lock and the disk cache is
+    re-checked after acquiring it, so concurrent processes hitting an expired
+    token trigger a single refresh instead of a stampede.
+    """
+    cache_key = _cache_scope(creds)
     cached = _token_cache.get(cache_key)
-    if cached and cached["expires_at"] > time.time() + 60:
+    if _valid(cached):
+        return cached["token"]
+
+    cached = _load_token_file().get(cache_key)
+    if _valid(cached):
+        _token_cache[cache_key] = cached
         return cached["token"]
 
-    base = _api_base(creds.get("domain", "feishu"))
-    resp = requests.post(
+    with _token_file_lock():
+        tokens = _load_token_file()
+        if _valid(tokens.get(cache_key)):
+            _token_cache[cache_key] = tokens[cache_key]
+            return tokens[cache_key]["token"]
+        entry = _fetch_token(creds, session)
+        tokens[cache_key] = entry
+        try:
+            _save_token_file(tokens)
+        except OSError as e:
+            print(f"Warning: could not persist token ({e})", file=sys.stderr)
+    _token_cache[cache_key] = entry
+    return entry["token"]
+
+
+def _invalidate_token(creds: dict, token: str):
+    """
+    Forget a token the API rejected, in-process and on disk.
+
+    Only the exact rejected token is removed, so a fresh one that another
+    process stored in the meantime survives.
+    """
+    cache_key = _cache_scope(creds)
+    if _token_cache.get(cache_key, {}).get("token") == token:
+        del _token_cache[cache_key]
+    with _token_file_lock():
+        tokens = _load_token_file()
+        if tokens.get(cache_key, {}).get("token") != token:
+            return
+        del tokens[cache_key]
+        try:
+            _save_token_file(tokens)
+        except OSError as e:
+            print(f"Warning: could not update token cache ({e})", file=sys.stderr)
+
+
+def _fetch_token(creds: dict, session: Optional[requests.Session] = None) -> dict:
+    """Request a new tenant access token from the API."""
+    base = _api_base(creds.get("domain", "feishu"), creds.get("api_base"))
+    data = _request_json(
+        session or requests,  # module-level requests.request() as a fallback
+        "POST",
         f"{base}/auth/v3/tenant_access_token/internal",
         json={"app_id": creds["app_id"], "app_secret": creds["app_secret"]},
     )
-    data = resp.json()
     if data.get("code") != 0:
         raise RuntimeError(f"Token error: {data.get('msg')}")
 
-    token = data["tenant_access_token"]
-    _token_cache[cache_key] = {
-        "token": token,
+    return {
+        "token": data["tenant_access_token"],
         "expires_at": time.time() + data.get("expire", 7200),
     }
-    return token
+
+
+# ─── Image Optimization ──────────────────────────────────────────────────
+
+IMAGE_MIME = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+    "bmp": "image/bmp",
+    "tiff": "image/tiff",
+}
+_MAGIC = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+]
+
+
+def _sniff_format(content: bytes) -> Optional[str]:
+    """Detect the real image format from magic bytes (file extensions lie)."""
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "webp"
+    for magic, fmt in _MAGIC:
+        if content.startswith(magic):
+            return fmt
+    return None
+
+
+def _optimize_image(
+    content: bytes,
+    max_width: int = IMAGE_MAX_WIDTH,
+    image_format: str = IMAGE_FORMAT,
+) -> tuple[bytes, str]:
+    """
+    Downscale to max_width and re-encode. Returns (bytes, format).
+
+    "auto" keeps JPEG as quality-bounded JPEG and everything else as optimized
+    PNG (lossless, best for charts). The original bytes are returned when
+    Pillow is missing, the image is animated, or the result is not smaller.
+    """
+    src_fmt = _sniff_format(content) or "png"
+    if image_format == "raw" or Image is None:
+        return content, src_fmt
+
+    try:
+        with Image.open(io.BytesIO(content)) as img:
+            if getattr(img, "is_animated", False):
+                return content, src_fmt
+            img.load()
+            if max_width and img.width > max_width:
+                if img.mode not in ("RGB", "RGBA", "L", "LA"):
+                    img = img.convert("RGBA")
+                height = max(1, round(img.height * max_width / img.width))
+                img = img.resize((max_width, height), Image.LANCZOS)
+
+            fmt = image_format if image_format != "auto" else ("jpeg" if src_fmt == "jpeg" else "png")
+            if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+                # JPEG has no alpha: flatten onto white like the card background
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+
+            buf = io.BytesIO()
+            if fmt == "png":
+                img.save(buf, "PNG", optimize=True)
+            elif fmt == "jpeg":
+                img.save(buf, "JPEG", quality=IMAGE_QUALITY, optimize=True, progressive=True)
+            elif fmt == "webp":
+                img.save(buf, "WEBP", quality=IMAGE_QUALITY, method=6)
+            else:
+                raise ValueError(f"unsupported image_format '{fmt}'")
+    except (OSError, ValueError) as e:
+        print(f"Warning: image optimization skipped ({e})", file=sys.stderr)
+        return content, src_fmt
+
+    out = buf.getvalue()
+    # Resampling can add colors and grow a flat-color PNG; never upload more bytes
+    if len(out) >= len(content):
+        return content, src_fmt
+    return out, fmt
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write via a uniquely named temp file + rename, safe across threads and processes."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _prune_dir(directory: Path, max_bytes: int):
+    """Delete least recently modified files until the directory fits in max_bytes."""
+    entries = []
+    for e in os.scandir(directory):
+        if e.name.endswith(".tmp"):
+            continue  # in-flight write from another thread / process
+        try:
+            if e.is_file():
+                st = e.stat()
+                entries.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            continue  # removed or renamed concurrently
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+
+
+def _cached_optimize(
+    content: bytes,
+    digest: str,
+    max_width: int = IMAGE_MAX_WIDTH,
+    image_format: str = IMAGE_FORMAT,
+) -> tuple[bytes, str]:
+    """_optimize_image with results cached on disk by source hash + settings."""
+    if image_format == "raw" or Image is None:
+        return _optimize_image(content, max_width, image_format)
+
+    cache_dir = CACHE_DIR / "optimized"
+    stem = f"{digest}-{image_format}-{max_width}"
+    try:
+        for hit in cache_dir.glob(stem + ".*"):
+            os.utime(hit)  # mark as recently used for pruning
+            return hit.read_bytes(), hit.suffix[1:]
+    except OSError:
+        pass
+
+    out, fmt = _optimize_image(content, max_width, image_format)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(cache_dir / f"{stem}.{fmt}", out)
+        _prune_dir(cache_dir, OPTIMIZED_CACHE_MAX_BYTES)
+    except OSError as e:
+        print(f"Warning: could not cache optimized image ({e})", file=sys.stderr)
+    return out, fmt
+
+
+def _rasterize_svgs(svg_paths: list[str], width: int) -> tuple[dict, dict]:
+    """
+    Rasterize .svg files in one process-pool batch, reusing its PNG cache.
+
+    Returns ({svg_path: png_path}, {svg_path: exception}). PNGs stay in the
+    rasterizer cache, so nothing is written next to the source SVGs.
+    """
+    if str(SVG_SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SVG_SCRIPTS_DIR))
+    try:
+        from rasterize import rasterize_many
+    except ImportError as e:
+        return {}, {p: RuntimeError(f"SVG images need svg-ui-templates/scripts/rasterize.py ({e})") for p in svg_paths}
+
+    try:
+        results = rasterize_many([{"svg": p, "out": None} for p in svg_paths], output_width=width)
+    except Exception as e:  # e.g. the process pool could not be started
+        return {}, {p: RuntimeError(f"SVG rasterization failed: {e}") for p in svg_paths}
+    pngs, errors = {}, {}
+    for path, r in zip(svg_paths, results):
+        if r["error"]:
+            errors[path] = RuntimeError(f"SVG rasterization failed: {r['error'].splitlines()[0]}")
+        else:
+            pngs[path] = r["out"]
+    return pngs, errors
+
+
+# ─── Image Key Cache ─────────────────────────────────────────────────────
+
+
+class ImageKeyCache:
+    """
+    Persistent map of (app scope, sha256 of image bytes) -> image_key, where
+    the scope is app_id, or app_id@<api root> for non-default API roots.
+
+    Backed by SQLite so several processes (one-shot CLI sends, concurrent
+    agents) can share it safely. Entries expire after `ttl` seconds and the
+    least recently used ones are evicted beyond `max_entries`. Hit/miss
+    counters are kept both per instance and cumulatively on disk.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = IMAGE_CACHE_TTL,
+        max_entries: int = IMAGE_CACHE_MAX_ENTRIES,
+    ):
+        self.path = Path(path or CACHE_DIR / "image_keys.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS image_keys ("
+                " app_id TEXT, digest TEXT, image_key TEXT, size INTEGER,"
+                " created_at REAL, last_used REAL, PRIMARY KEY (app_id, digest))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON image_keys (last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+
+    @contextmanager
+    def _connect(self):
+        """One short-lived connection per operation, committed on success (thread-safe)."""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _bump(db: sqlite3.Connection, name: str, by: int = 1):
+        db.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, by),
+        )
+
+    def get(self, app_id: str, digest: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT image_key, size, created_at FROM image_keys WHERE app_id = ? AND digest = ?",
+                (app_id, digest),
+            ).fetchone()
+            if row and row[2] + self.ttl > now:
+                db.execute(
+                    "UPDATE image_keys SET last_used = ? WHERE app_id = ? AND digest = ?",
+                    (now, app_id, digest),
+                )
+                self._bump(db, "hits")
+                self._bump(db, "bytes_saved", row[1])
+                self.hits += 1
+                return row[0]
+            if row:
+                db.execute("DELETE FROM image_keys WHERE app_id = ? AND digest = ?", (app_id, digest))
+            self._bump(db, "misses")
+        self.misses += 1
+        return None
+
+    def put(self, app_id: str, digest: str, image_key: str, size: int = 0):
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO image_keys VALUES (?, ?, ?, ?, ?, ?)",
+                (app_id, digest, image_key, size, now, now),
+            )
+            db.execute("DELETE FROM image_keys WHERE created_at < ?", (now - self.ttl,))
+            db.execute(
+                "DELETE FROM image_keys WHERE rowid IN ("
+                " SELECT rowid FROM image_keys ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        """Per-instance and cumulative (all processes) hit/miss counts."""
+        with self._connect() as db:
+            totals = dict(db.execute("SELECT name, value FROM stats").fetchall())
+            entries = db.execute("SELECT COUNT(*) FROM image_keys").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "total_bytes_saved": totals.get("bytes_saved", 0),
+            "entries": entries,
+            "path": str(self.path),
+        }
 
 
 # ─── Core Functions ──────────────────────────────────────────────────────
 
 
+class TokenBucket:
+    """asyncio token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0 tokens per second, got {rate}")
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ImageUploadError(RuntimeError):
+    """
+    One or more images in a batch failed to upload.
+
+    keys:   {path: image_key} for the uploads that succeeded (reusable via "image_key" elements)
+    errors: {path: exception} for the ones that failed
+    """
+
+    def __init__(self, keys: dict, errors: dict):
+        self.keys = keys
+        self.errors = errors
+        detail = "; ".join(f"{p}: {e}" for p, e in errors.items())
+        super().__init__(f"{len(errors)} of {len(keys) + len(errors)} image uploads failed: {detail}")
+
+
+class CardUpdateError(RuntimeError):
+    """A card PATCH was rejected; code is the Feishu error code."""
+
+    def __init__(self, code, msg):
+        self.code = code
+        super().__init__(f"Update card failed: {msg}")
+
+
 class FeishuCardSender:
-    def __init__(self, creds: Optional[dict] = None):
+    def __init__(
+        self,
+        creds: Optional[dict] = None,
+        session: Optional[requests.Session] = None,
+        timeout=REQUEST_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        upload_workers: int = UPLOAD_WORKERS,
+        image_cache=True,
+        max_width: int = IMAGE_MAX_WIDTH,
+        image_format: str = IMAGE_FORMAT,
+    ):
+        """
+        image_cache: True for the shared on-disk ImageKeyCache, False to
+        always upload, or an ImageKeyCache instance.
+        max_width / image_format: pre-upload optimization (see _optimize_image);
+        image_format="raw" uploads files byte-for-byte.
+        """
         self.creds = creds or _get_credentials()
-        self.base = _api_base(self.creds.get("domain", "feishu"))
+        self.base = _api_base(self.creds.get("domain", "feishu"), self.creds.get("api_base"))
+        self.cache_scope = _cache_scope(self.creds)
+        self.session = session or _new_session()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.upload_workers = upload_workers
+        if image_cache is True:
+            try:
+                image_cache = ImageKeyCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: image cache unavailable ({e}), uploading without it", file=sys.stderr)
+                image_cache = None
+        self.image_cache = image_cache or None
+        self.max_width = max_width
+        self.image_format = image_format
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
 
     @property
     def token(self) -> str:
-        return _get_token(self.creds)
+        return _get_token(self.creds, self.session)
 
-    def upload_image(self, image_path: str) -> str:
-        """Upload a local image file and return image_key."""
-        with open(image_path, "rb") as f:
-            resp = requests.post(
-                f"{self.base}/im/v1/images",
-                headers={"Authorization": f"Bearer {self.token}"},
-                data={"image_type": "message"},
-                files={"image": (Path(image_path).name, f, "image/png")},
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        """
+        Authorized request against the open API, with pooling and retries.
+
+        A token the API rejects (e.g. revoked while still cached) is evicted
+        from the shared cache and the request is retried once with a new one.
+        """
+        extra_headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token = self.token
+            data = _request_json(
+                self.session,
+                method,
+                f"{self.base}{path}",
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                headers={"Authorization": f"Bearer {token}", **extra_headers},
+                **kwargs,
             )
-        data = resp.json()
+            if data.get("code") not in INVALID_TOKEN_CODES or attempt:
+                return data
+            print(f"Warning: token rejected ({data.get('msg')}), fetching a new one", file=sys.stderr)
+            _invalidate_token(self.creds, token)
+
+    def upload_image(self, image_path: str) -> str:
+        """
+        Upload a local image file and return image_key.
+
+        Images already uploaded by this app (same bytes, same optimization
+        settings) are served from image_cache. Otherwise the image is
+        downscaled/re-encoded first and sent with its real content type.
+        """
+        # Read up front so the multipart body can be replayed on retry
+        content = Path(image_path).read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        cache_key = f"{digest}:{self.image_format}-{self.max_width}"
+        app_id = self.cache_scope
+        if self.image_cache:
+            try:
+                cached = self.image_cache.get(app_id, cache_key)
+            except sqlite3.Error as e:
+                print(f"Warning: image cache unavailable ({e}), uploading", file=sys.stderr)
+                cached = None
+            if cached:
+                return cached
+
+        body, fmt = _cached_optimize(content, digest, self.max_width, self.image_format)
+        filename = f"{Path(image_path).stem}.{'jpg' if fmt == 'jpeg' else fmt}"
+        data = self._request(
+            "POST",
+            "/im/v1/images",
+            data={"image_type": "message"},
+            files={"image": (filename, body, IMAGE_MIME.get(fmt, "application/octet-stream"))},
+        )
         if data.get("code") != 0:
             raise RuntimeError(f"Image upload failed: {data.get('msg')}")
-        return data["data"]["image_key"]
+        image_key = data["data"]["image_key"]
+        if self.image_cache:
+            try:
+                self.image_cache.put(app_id, cache_key, image_key, len(body))
+            except sqlite3.Error as e:
+                print(f"Warning: could not cache image_key ({e})", file=sys.stderr)
+        return image_key
 
-    def send_rich_card(
+    def upload_images(self, image_paths: list[str]) -> dict:
+        """
+        Upload several images concurrently and return {path: image_key}.
+
+        Duplicate paths are uploaded once, and .svg paths are rasterized to PNG
+        in one batch first. Every upload runs to completion even if another
+        fails; failures are then raised together as ImageUploadError, which
+        still carries the keys that did succeed.
+        """
+        unique = list(dict.fromkeys(image_paths))
+        if not unique:
+            return {}
+        self.token  # fetch once here rather than racing for it in every worker
+
+        # SVGs (e.g. svg-ui-templates panels) are rasterized together up front
+        svgs = [p for p in unique if str(p).lower().endswith(".svg")]
+        pngs, errors = _rasterize_svgs(svgs, self.max_width) if svgs else ({}, {})
+        unique = [p for p in unique if p not in errors]
+
+        keys = {}
+        workers = max(1, min(self.upload_workers, len(unique) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(self.upload_image, pngs.get(path, path)) for path in unique}
+            for path, fut in futures.items():
+                try:
+                    keys[path] = fut.result()
+                except Exception as e:
+                    errors[path] = e
+        if errors:
+            raise ImageUploadError(keys, errors)
+        return keys
+
+    def build_card(
         self,
-        chat_id: str,
         title: str,
         elements: list[dict],
         header_template: str = "blue",
-        reply_to: Optional[str] = None,
+        image_keys: Optional[dict] = None,
+        update_multi: bool = False,
     ) -> dict:
         """
-        Send a rich card with mixed text and images.
+        Build the schema 2.0 card JSON for `elements` (see send_rich_card).
 
-        elements: list of dicts, each with:
-          - {"type": "markdown", "content": "**bold** text"}
-          - {"type": "image", "path": "/tmp/img.png", "alt": "description"}
-          - {"type": "image_key", "key": "img_v3_xxx", "alt": "description"}
-          - {"type": "hr"}
-          - {"type": "note", "content": "footer text"}
-          - {"type": "column_set", "columns": [...]}  # advanced
+        image elements are resolved through image_keys ({path: image_key});
+        nothing is uploaded here. update_multi marks the card as patchable
+        for every viewer, which in-place updates (LiveCard) require.
         """
+        image_keys = image_keys or {}
         card_elements = []
         for elem in elements:
             t = elem.get("type", "")
             if t == "markdown":
                 card_elements.append({"tag": "markdown", "content": elem["content"]})
             elif t == "image":
-                image_key = self.upload_image(elem["path"])
                 card_elements.append(
                     {
                         "tag": "img",
-                        "img_key": image_key,
+                        "img_key": image_keys[elem["path"]],
                         "alt": {"tag": "plain_text", "content": elem.get("alt", "")},
                     }
                 )
@@ -162,9 +850,12 @@ class FeishuCardSender:
             else:
                 print(f"Warning: unknown element type '{t}', skipping", file=sys.stderr)
 
-        card = {
+        config = {"wide_screen_mode": True}
+        if update_multi:
+            config["update_multi"] = True
+        return {
             "schema": "2.0",
-            "config": {"wide_screen_mode": True},
+            "config": config,
             "header": {
                 "title": {"tag": "plain_text", "content": title},
                 "template": header_template,
@@ -172,37 +863,131 @@ class FeishuCardSender:
             "body": {"elements": card_elements},
         }
 
+    def send_card(self, chat_id: str, card, reply_to: Optional[str] = None) -> dict:
+        """Send a pre-built card (dict, or its JSON string) as a new message or a reply."""
+        if not isinstance(card, str):
+            card = json.dumps(card, ensure_ascii=False)
+        # uuid makes retried sends idempotent on Feishu's side (deduped for 1h)
         payload = {
             "receive_id": chat_id,
             "msg_type": "interactive",
-            "content": json.dumps(card, ensure_ascii=False),
+            "content": card,
+            "uuid": str(uuid.uuid4()),
         }
 
         if reply_to:
-            resp = requests.post(
-                f"{self.base}/im/v1/messages/{reply_to}/reply",
-                headers={
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json",
+            data = self._request(
+                "POST",
+                f"/im/v1/messages/{reply_to}/reply",
+                json={
+                    "msg_type": "interactive",
+                    "content": payload["content"],
+                    "uuid": payload["uuid"],
                 },
-                json={"msg_type": "interactive", "content": json.dumps(card, ensure_ascii=False)},
             )
         else:
-            resp = requests.post(
-                f"{self.base}/im/v1/messages",
-                headers={
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json",
-                },
+            data = self._request(
+                "POST",
+                "/im/v1/messages",
                 params={"receive_id_type": "chat_id"},
                 json=payload,
             )
 
-        data = resp.json()
         if data.get("code") != 0:
             raise RuntimeError(f"Send card failed: {data.get('msg')}")
         return data
 
+    def update_card(self, message_id: str, card: dict) -> dict:
+        """Replace the content of an already-sent card message in place."""
+        data = self._request(
+            "PATCH",
+            f"/im/v1/messages/{message_id}",
+            json={"content": json.dumps(card, ensure_ascii=False)},
+        )
+        if data.get("code") != 0:
+            raise CardUpdateError(data.get("code"), data.get("msg"))
+        return data
+
+    def send_rich_card(
+        self,
+        chat_id: str,
+        title: str,
+        elements: list[dict],
+        header_template: str = "blue",
+        reply_to: Optional[str] = None,
+    ) -> dict:
+        """
+        Send a rich card with mixed text and images.
+
+        elements: list of dicts, each with:
+          - {"type": "markdown", "content": "**bold** text"}
+          - {"type": "image", "path": "/tmp/img.png", "alt": "description"}
+          - {"type": "image_key", "key": "img_v3_xxx", "alt": "description"}
+          - {"type": "hr"}
+          - {"type": "note", "content": "footer text"}
+          - {"type": "column_set", "columns": [...]}  # advanced
+
+        Images are uploaded concurrently (up to upload_workers at a time)
+        before the card is assembled; element order is preserved.
+        """
+        image_keys = self.upload_images(
+            [e["path"] for e in elements if e.get("type") == "image"]
+        )
+        card = self.build_card(title, elements, header_template, image_keys)
+        return self.send_card(chat_id, card, reply_to)
+
+    async def broadcast_async(
+        self,
+        chat_ids: list[str],
+        title: str,
+        elements: list[dict],
+        header_template: str = "blue",
+        rate: float = BROADCAST_RATE,
+        burst: int = BROADCAST_BURST,
+        concurrency: int = BROADCAST_CONCURRENCY,
+    ) -> list[dict]:
+        """
+        Send one card to many chats concurrently.
+
+        Images are uploaded and the card JSON is serialized once; the sends
+        then fan out under a token-bucket limit (`rate` per second, bursts of
+        `burst`) with at most `concurrency` requests in flight. One chat
+        failing does not affect the others.
+
+        Returns one dict per chat_id, in input order:
+            {"chat_id", "ok", "message_id", "error", "seconds"}
+        """
+        bucket = TokenBucket(rate, burst)  # validates rate before any upload
+        image_keys = await asyncio.to_thread(
+            self.upload_images, [e["path"] for e in elements if e.get("type") == "image"]
+        )
+        content = json.dumps(
+            self.build_card(title, elements, header_template, image_keys), ensure_ascii=False
+        )
+        await asyncio.to_thread(lambda: self.token)  # one token fetch before fanning out
+
+        inflight = asyncio.Semaphore(concurrency)
+
+        async def send_one(chat_id: str) -> dict:
+            result = {"chat_id": chat_id, "ok": False, "message_id": None, "error": None, "seconds": 0.0}
+            async with inflight:
+                await bucket.acquire()
+                t0 = time.perf_counter()
+                try:
+                    data = await asyncio.to_thread(self.send_card, chat_id, content)
+                    result["ok"] = True
+                    result["message_id"] = data["data"]["message_id"]
+                except Exception as e:
+                    result["error"] = str(e)
+                result["seconds"] = time.perf_counter() - t0
+            return result
+
+        return list(await asyncio.gather(*(send_one(c) for c in chat_ids)))
+
+    def broadcast(self, chat_ids: list[str], title: str, elements: list[dict], **kwargs) -> list[dict]:
+        """Synchronous wrapper around broadcast_async (not for use inside a running loop)."""
+        return asyncio.run(self.broadcast_async(chat_ids, title, elements, **kwargs))
+
     def send_image_report(
         self,
         chat_id: str,
@@ -230,30 +1015,232 @@ class FeishuCardSender:
     ) -> dict:
         """
         Send a structured progress report.
+        Section images are uploaded concurrently via send_rich_card.
 
         sections: list of dicts:
           - {"heading": "...", "body": "...", "image": "/path/to/img.png" (optional)}
         """
-        elements = []
-        for i, sec in enumerate(sections):
-            if i > 0:
-                elements.append({"type": "hr"})
-            heading = sec.get("heading", "")
-            body = sec.get("body", "")
-            md = ""
-            if heading:
-                md += f"## {heading}\n\n"
-            if body:
-                md += body
-            if md:
-                elements.append({"type": "markdown", "content": md})
-            if sec.get("image"):
-                elements.append(
-                    {"type": "image", "path": sec["image"], "alt": heading or "image"}
-                )
+        elements = progress_elements(sections)
         return self.send_rich_card(chat_id, title, elements, header_template)
 
 
+def progress_elements(sections: list[dict]) -> list[dict]:
+    """Turn progress sections ({"heading", "body", "image"}) into card elements."""
+    elements = []
+    for i, sec in enumerate(sections):
+        if i > 0:
+            elements.append({"type": "hr"})
+        heading = sec.get("heading", "")
+        body = sec.get("body", "")
+        md = ""
+        if heading:
+            md += f"## {heading}\n\n"
+        if body:
+            md += body
+        if md:
+            elements.append({"type": "markdown", "content": md})
+        if sec.get("image"):
+            elements.append(
+                {"type": "image", "path": sec["image"], "alt": heading or "image"}
+            )
+    return elements
+
+
+# ─── Live Card ───────────────────────────────────────────────────────────
+
+
+class LiveCard:
+    """
+    A progress card that is sent once and then patched in place.
+
+    The first update() sends a new message and records its message_id; later
+    updates PATCH that message instead of posting near-duplicate cards. Only
+    images that are new or changed on disk (path + mtime + size) since the
+    last send are uploaded, and an update whose card JSON is identical to the
+    last one sent is skipped.
+
+    Updates arriving within min_interval of the previous send are coalesced:
+    the latest one is kept and sent when the interval elapses (by a timer, or
+    immediately on flush()/close()). Pass block=True to wait instead, which
+    suits one-shot CLI processes.
+
+    With `key`, state is persisted under CACHE_DIR/live_cards/ so separate
+    processes keep patching the same message.
+
+    Usage:
+        with LiveCard(sender, chat_id, "🧬 Pipeline", key="run42") as live:
+            live.update([{"type": "markdown", "content": "Step 1/3 ..."}])
+            live.update_progress([{"heading": "QC", "body": "done", "image": "qc.png"}])
+    """
+
+    def __init__(
+        self,
+        sender: FeishuCardSender,
+        chat_id: str,
+        title: str,
+        header_template: str = "indigo",
+        min_interval: float = LIVE_MIN_INTERVAL,
+        reply_to: Optional[str] = None,
+        key: Optional[str] = None,
+    ):
+        self.sender = sender
+        self.chat_id = chat_id
+        self.title = title
+        self.header_template = header_template
+        self.min_interval = min_interval
+        self.reply_to = reply_to
+        self.state_path = None
+        if key:
+            scope = sender.cache_scope
+            if scope != sender.creds["app_id"]:  # non-default API root: keep its state apart
+                key = f"{key}-{hashlib.sha256(scope.encode()).hexdigest()[:12]}"
+            self.state_path = CACHE_DIR / "live_cards" / f"{key}.json"
+        self.state = {
+            "scope": sender.cache_scope, "message_id": None, "card_hash": None, "sent_at": 0.0, "images": {},
+        }
+        self._pending: Optional[list[dict]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        if self.state_path and self.state_path.exists():
+            try:
+                saved = json.loads(self.state_path.read_text())
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring live card state ({e})", file=sys.stderr)
+                saved = {}
+            # State written for another app / API root holds foreign message ids and image_keys
+            if saved.get("scope", sender.creds["app_id"]) == self.state["scope"]:
+                self.state.update(saved)
+            elif saved:
+                print("Warning: ignoring live card state from another app or API root", file=sys.stderr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def message_id(self) -> Optional[str]:
+        return self.state["message_id"]
+
+    def update(
+        self,
+        elements: list[dict],
+        title: Optional[str] = None,
+        header_template: Optional[str] = None,
+        force: bool = False,
+        block: bool = False,
+    ) -> Optional[dict]:
+        """
+        Show `elements` on the live card. Returns the API response, or None
+        when the update was coalesced (deferred) or the card is unchanged.
+        """
+        with self._lock:
+            if title:
+                self.title = title
+            if header_template:
+                self.header_template = header_template
+            self._pending = elements
+            wait = self.state["sent_at"] + self.min_interval - time.time()
+            if force or wait <= 0 or not self.message_id:
+                return self._flush_locked()
+            if block:
+                time.sleep(wait)
+                return self._flush_locked()
+            if self._timer is None:
+                self._timer = threading.Timer(wait, self._timer_flush)
+                self._timer.start()
+            return None
+
+    def update_progress(self, sections: list[dict], **kwargs) -> Optional[dict]:
+        """update() with send_progress_report-style sections."""
+        return self.update(progress_elements(sections), **kwargs)
+
+    def flush(self) -> Optional[dict]:
+        """Send a pending (coalesced) update now."""
+        with self._lock:
+            return self._flush_locked()
+
+    def close(self):
+        self.flush()
+
+    def _timer_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Warning: live card update failed: {e}", file=sys.stderr)
+
+    def _flush_locked(self) -> Optional[dict]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        elements, self._pending = self._pending, None
+        if elements is None:
+            return None
+
+        try:
+            image_keys = self._resolve_images(elements)
+            card = self.sender.build_card(
+                self.title, elements, self.header_template, image_keys, update_multi=True
+            )
+            card_hash = hashlib.sha256(
+                json.dumps(card, ensure_ascii=False, sort_keys=True).encode()
+            ).hexdigest()
+            if card_hash == self.state["card_hash"]:
+                return None
+
+            data = None
+            if self.message_id:
+                try:
+                    data = self.sender.update_card(self.message_id, card)
+                except CardUpdateError as e:
+                    if e.code not in MESSAGE_GONE_CODES:
+                        raise
+                    # message deleted or recalled: start a new card
+                    print(f"Warning: {e}; sending a new card", file=sys.stderr)
+            if data is None:
+                data = self.sender.send_card(self.chat_id, card, self.reply_to)
+                self.state["message_id"] = data["data"]["message_id"]
+        except Exception:
+            # Rate limit, server error, network...: keep the update for the next flush
+            self._pending = elements
+            raise
+
+        self.state["card_hash"] = card_hash
+        self.state["sent_at"] = time.time()
+        self._save_state()
+        return data
+
+    def _resolve_images(self, elements: list[dict]) -> dict:
+        """{path: image_key}, uploading only images new or changed since the last send."""
+        known = self.state["images"]
+        current, keys, to_upload = {}, {}, []
+        for elem in elements:
+            if elem.get("type") != "image":
+                continue
+            path = elem["path"]
+            st = os.stat(path)
+            sig = f"{path}|{st.st_mtime_ns}|{st.st_size}"
+            current[path] = sig
+            if sig in known:
+                keys[path] = known[sig]
+            else:
+                to_upload.append(path)
+        keys.update(self.sender.upload_images(to_upload))
+        # Only remember images still on the card
+        self.state["images"] = {sig: keys[path] for path, sig in current.items()}
+        return keys
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.state_path, json.dumps(self.state).encode())
+        except OSError as e:
+            print(f"Warning: could not persist live card state ({e})", file=sys.stderr)
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -261,13 +1248,43 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Send Feishu rich card")
     parser.add_argument("--chat", default=DEFAULT_CHAT_ID, help="Chat ID")
-    parser.add_argument("--title", required=True, help="Card title")
+    parser.add_argument("--chats", nargs="+", metavar="CHAT_ID", help="Broadcast to several chats")
+    parser.add_argument("--rate", type=float, default=BROADCAST_RATE, help="Broadcast sends per second")
+    parser.add_argument("--title", help="Card title")
     parser.add_argument("--image", action="append", help="Image path(s)")
     parser.add_argument("--text", action="append", help="Text section(s)")
     parser.add_argument("--template", default="blue", help="Header color template")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT[1], help="Read timeout (s)")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES, help="Max retries per request")
+    parser.add_argument("--max-width", type=int, default=IMAGE_MAX_WIDTH, help="Downscale images wider than this")
+    parser.add_argument(
+        "--format", default=IMAGE_FORMAT, choices=["auto", "png", "jpeg", "webp", "raw"],
+        help="Upload encoding (raw = send files unchanged)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always re-upload images")
+    parser.add_argument("--cache-stats", action="store_true", help="Print image cache stats and exit")
+    parser.add_argument("--live", metavar="KEY", help="Update the live card KEY in place (sent on first use)")
+    parser.add_argument(
+        "--min-interval", type=float, default=LIVE_MIN_INTERVAL,
+        help="Min seconds between live card updates",
+    )
     args = parser.parse_args()
 
-    sender = FeishuCardSender()
+    if args.cache_stats:
+        print(json.dumps(ImageKeyCache().stats(), indent=2))
+        sys.exit(0)
+    if not args.title:
+        parser.error("--title is required")
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+
+    sender = FeishuCardSender(
+        timeout=(REQUEST_TIMEOUT[0], args.timeout),
+        max_retries=args.retries,
+        image_cache=not args.no_cache,
+        max_width=args.max_width,
+        image_format=args.format,
+    )
     elements = []
     texts = args.text or []
     images = args.image or []
@@ -280,5 +1297,23 @@ if __name__ == "__main__":
         if i < len(images):
             elements.append({"type": "image", "path": images[i], "alt": f"Image {i+1}"})
 
-    result = sender.send_rich_card(args.chat, args.title, elements, args.template)
-    print(f"✅ Sent! message_id={result['data']['message_id']}")
+    if args.chats:
+        results = sender.broadcast(args.chats, args.title, elements, header_template=args.template, rate=args.rate)
+        for r in results:
+            mark = "✅" if r["ok"] else "❌"
+            print(f"{mark} {r['chat_id']} {r['message_id'] or r['error']} ({r['seconds']:.2f}s)")
+        sys.exit(0 if all(r["ok"] for r in results) else 1)
+    elif args.live:
+        live = LiveCard(
+            sender, args.chat, args.title, args.template,
+            min_interval=args.min_interval, key=args.live,
+        )
+        result = live.update(elements, title=args.title, block=True)
+        status = "Updated" if result else "Unchanged"
+        print(f"✅ {status}! message_id={live.message_id}")
+    else:
+        result = sender.send_rich_card(args.chat, args.title, elements, args.template)
+        print(f"✅ Sent! message_id={result['data']['message_id']}")
+    if sender.image_cache:
+        st = sender.image_cache.stats()
+        print(f"   image cache: {st['hits']} hit(s), {st['misses']} miss(es)")
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+SVG → PNG 批量栅格化 (进程池 + 内容哈希缓存)
+
+逐张执行 `python3 -c "import cairosvg; ..."` 每次都要付出解释器和 cairosvg 的启动开销,
+内容相同的面板也会被重复栅格化。本模块一次接收多张 SVG:
+  - PNG 按 "SVG 内容 sha256 + 输出宽度" 缓存, 重复的面板直接命中, 不再启动 cairosvg
+  - 未命中的 SVG 分发到进程池, 每个 worker 只导入一次 cairosvg
+  - 同一批次内内容相同的 SVG 只栅格化一次
+  - 缓存目录超过上限时按最近使用时间淘汰
+
+用法:
+    from rasterize import rasterize, rasterize_many
+
+    png = rasterize("/tmp/status.svg")                     # → /tmp/status.png
+    png = rasterize(svg_text, out="/tmp/panel.png")        # SVG 字符串也可以
+
+    results = rasterize_many(
+        ["a.svg", "b.svg", {"svg": render("list-panel", data), "out": "/tmp/list.png"}],
+        output_width=2400,
+    )
+    for r in results:                                       # 与输入顺序一致
+        print(r["index"], r["out"], r["cached"], r["error"])
+
+命令行:
+    python3 rasterize.py outputs/*.svg                      # 每个 SVG 旁生成同名 PNG
+    python3 rasterize.py panels/*.svg -o pngs/ --width 1600 -j 4
+    python3 rasterize.py --cache-stats
+    python3 rasterize.py --clear-cache
+
+source 可以是:
+    SVG 文件路径 (str / Path)        默认输出到同目录同名 .png; 相对 href 按文件位置解析
+    SVG 文本 (以 "<" 开头的 str) 或 bytes
+    dict: {"svg": 上述任一, "out": 输出路径, "width": 覆盖默认输出宽度}
+
+缓存只看 SVG 文本本身; 通过相对路径 href 引用的外部图片变了不会失效,
+需要时用 render_svg.py 的 images 参数内嵌 (data URI) 或 cache=False。
+
+环境变量:
+    SVG_PNG_CACHE_DIR     缓存目录 (默认 ~/.cache/medgeclaw/svg_png)
+    SVG_PNG_CACHE_MAX_MB  缓存上限 (默认 500 MB)
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+DEFAULT_WIDTH = 2400
+CACHE_DIR = Path(os.environ.get("SVG_PNG_CACHE_DIR") or Path.home() / ".cache" / "medgeclaw" / "svg_png")
+CACHE_MAX_BYTES = int(float(os.environ.get("SVG_PNG_CACHE_MAX_MB", "500")) * 1024 * 1024)
+
+_svg2png = None  # worker 内缓存的 cairosvg.svg2png
+_import_error = None  # worker 内 cairosvg 导入失败的异常, 由 _rasterize_one 按任务上报
+
+
+def _init_worker() -> None:
+    """
+    进程池 initializer: 每个 worker 只导入一次 cairosvg。
+    导入失败时不抛出 (initializer 抛异常会使整个进程池 broken), 只记下异常。
+    """
+    global _svg2png, _import_error
+    if _svg2png is None and _import_error is None:
+        try:
+            import cairosvg
+        except Exception as e:  # ImportError, 或缺少 libcairo 时的 OSError
+            _import_error = e
+        else:
+            _svg2png = cairosvg.svg2png
+
+
+def cache_key(svg: bytes, output_width: int) -> str:
+    """缓存键: SVG 内容与输出宽度的 sha256"""
+    return hashlib.sha256(svg + b"\0" + str(int(output_width)).encode()).hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.png"
+
+
+def _normalize(source) -> dict:
+    """把 source 统一成 {"svg": bytes, "url": 基准路径或 None, "out", "width", "label"}"""
+    spec = dict(source) if isinstance(source, dict) else {"svg": source}
+    if "svg" not in spec:
+        raise TypeError(f"source dict 必须包含 'svg', 得到: {source!r}")
+    svg = spec["svg"]
+    url = None
+    if isinstance(svg, bytes):
+        label = "<bytes>"
+    elif isinstance(svg, str) and svg.lstrip().startswith("<"):
+        svg, label = svg.encode("utf-8"), "<svg>"
+    else:
+        path = Path(svg)
+        svg, url, label = path.read_bytes(), str(path.resolve()), str(path)
+        spec.setdefault("out", str(path.with_suffix(".png")))
+    spec.update(svg=svg, url=url, label=label)
+    return spec
+
+
+def _rasterize_one(job: tuple[str, bytes, str | None, int]) -> dict:
+    """在 worker 中栅格化一张 SVG (异常不会向外抛出)"""
+    key, svg, url, width = job
+    t0 = time.perf_counter()
+    try:
+        _init_worker()
+        if _import_error is not None:
+            raise RuntimeError(f"cairosvg 不可用: {type(_import_error).__name__}: {_import_error}")
+        png = _svg2png(bytestring=svg, url=url, output_width=width)
+        return {"key": key, "png": png, "error": None, "seconds": time.perf_counter() - t0}
+    except Exception as e:
+        return {
+            "key": key,
+            "png": None,
+            "error": f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
+            "seconds": time.perf_counter() - t0,
+        }
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _cache_get(key: str) -> Path | None:
+    path = _cache_path(key)
+    try:
+        os.utime(path)  # 标记为最近使用, 淘汰时靠后
+        return path
+    except OSError:
+        return None
+
+
+def prune_cache(max_bytes: int = CACHE_MAX_BYTES, keep: set[str] = frozenset()) -> int:
+    """按最近使用时间淘汰缓存, 直到总大小不超过 max_bytes (keep 中的缓存键不淘汰); 返回删除的文件数"""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.is_file() and e.name.endswith(".png")]
+    except OSError:
+        return 0
+    total = sum(e.stat().st_size for e in entries)
+    removed = 0
+    for e in sorted(entries, key=lambda e: e.stat().st_mtime):
+        if total <= max_bytes:
+            break
+        if e.name[:-4] in keep:
+            continue
+        try:
+            size = e.stat().st_size
+            os.remove(e.path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def cache_stats() -> dict:
+    """缓存目录、文件数、总字节数与上限"""
+    try:
+        sizes = [e.stat().st_size for e in os.scandir(CACHE_DIR) if e.is_file() and e.name.endswith(".png")]
+    except OSError:
+        sizes = []
+    return {"dir": str(CACHE_DIR), "entries": len(sizes), "bytes": sum(sizes), "max_bytes": CACHE_MAX_BYTES}
+
+
+def clear_cache() -> None:
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def rasterize_many(
+    sources: list,
+    output_width: int = DEFAULT_WIDTH,
+    out_dir: str | None = None,
+    max_workers: int | None = None,
+    cache: bool = True,
+    verbose: bool = False,
+) -> list[dict]:
+    """
+    批量把 SVG 栅格化为 PNG, 结果按输入顺序返回。
+
+    Args:
+        sources: SVG 路径 / SVG 文本 / bytes / spec dict 列表 (见模块文档)
+        output_width: 默认输出宽度 (px), 与 cairosvg output_width 一致
+        out_dir: 指定后, 未显式给出 out 的 PNG 写到该目录 (文件名取 SVG 名, 文本输入取缓存键)
+        max_workers: 进程数, 默认 os.cpu_count(); 为 1 或只有一张需要栅格化时在当前进程执行
+        cache: 是否读写 PNG 缓存
+        verbose: 打印每张图的耗时和命中情况
+
+    Returns:
+        每个 source 一个 dict: index, svg (路径或 "<svg>"), out, key, cached,
+        seconds, error (失败时为带 traceback 的字符串, 其余图照常处理)。
+        文本输入且未指定 out / out_dir 时, out 为缓存中的 PNG 路径 (cache=False 时报错)。
+    """
+    t0 = time.perf_counter()
+    results, specs = [], []
+    for i, source in enumerate(sources):
+        result = {"index": i, "svg": None, "out": None, "key": None, "cached": False, "seconds": 0.0, "error": None}
+        results.append(result)
+        try:
+            spec = _normalize(source)
+        except Exception as e:
+            result["svg"] = str(source.get("svg") if isinstance(source, dict) else source)[:80]
+            result["error"] = f"{type(e).__name__}: {e}"
+            specs.append(None)
+            continue
+        width = int(spec.get("width") or output_width)
+        key = cache_key(spec["svg"], width)
+        out = spec.get("out")
+        if out_dir and not (isinstance(source, dict) and source.get("out")):
+            name = Path(spec["label"]).stem if spec["url"] else key[:16]
+            out = str(Path(out_dir) / f"{name}.png")
+        result.update(svg=spec["label"], key=key, out=out)
+        spec["width"] = width
+        specs.append(spec)
+
+    # 缓存命中的直接复制; 其余按缓存键去重后交给进程池
+    pending = {}
+    for result, spec in zip(results, specs):
+        if spec is None:
+            continue
+        hit = _cache_get(result["key"]) if cache else None
+        if hit is not None:
+            result["cached"] = True
+        elif result["key"] not in pending:
+            pending[result["key"]] = (result["key"], spec["svg"], spec["url"], spec["width"])
+
+    rendered = {}
+    if pending:
+        jobs = list(pending.values())
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            rendered = {r["key"]: r for r in map(_rasterize_one, jobs)}
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                    for r in pool.map(_rasterize_one, jobs):
+                        rendered[r["key"]] = r
+            except BrokenProcessPool as e:
+                # worker 异常退出 (崩溃 / OOM): 未完成的任务记为失败, 已完成的照常使用
+                for key in pending:
+                    rendered.setdefault(key, {"key": key, "png": None, "error": f"BrokenProcessPool: {e}", "seconds": 0.0})
+        if cache:
+            for r in rendered.values():
+                if r["png"] is not None:
+                    try:
+                        _write_atomic(_cache_path(r["key"]), r["png"])
+                    except OSError as e:
+                        print(f"⚠️  PNG 缓存写入失败: {e}", file=sys.stderr)
+
+    for result in results:
+        if result["error"] or result["key"] is None:
+            continue
+        r = rendered.get(result["key"])
+        try:
+            if r is not None:
+                result["seconds"] = r["seconds"]
+                if r["error"]:
+                    result["error"] = r["error"]
+                    continue
+            if result["out"] is None:
+                if not cache:
+                    raise ValueError("SVG 文本输入在 cache=False 时必须指定 out 或 out_dir")
+                result["out"] = str(_cache_path(result["key"]))
+            elif r is not None and r["png"] is not None:
+                _write_atomic(Path(result["out"]), r["png"])
+            else:
+                Path(result["out"]).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(_cache_path(result["key"]), result["out"])
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+    if cache and pending:
+        # 本批次返回的缓存路径不能被淘汰
+        prune_cache(keep={r["key"] for r in results if r["key"]})
+
+    elapsed = time.perf_counter() - t0
+    if verbose:
+        for r in results:
+            status = "❌" if r["error"] else ("♻️ " if r["cached"] else "✅")
+            print(f"{status} [{r['index']}] {r['svg']} → {r['out'] or '-'} {r['seconds']:.2f}s")
+        hits = sum(r["cached"] for r in results)
+        print(f"🖼️  {len(results)} 张 SVG, 缓存命中 {hits}, 栅格化 {len(pending)}, 总耗时 {elapsed:.2f}s")
+    for r in results:
+        if r["error"]:
+            print(f"⚠️  第 {r['index']} 张 SVG 栅格化失败: {r['error'].splitlines()[0]}", file=sys.stderr)
+    return results
+
+
+def rasterize(source, out: str | None = None, output_width: int = DEFAULT_WIDTH, cache: bool = True) -> str:
+    """栅格化单张 SVG 并返回 PNG 路径; 失败时抛出 RuntimeError"""
+    spec = dict(source) if isinstance(source, dict) else {"svg": source}
+    if out:
+        spec["out"] = out
+    result = rasterize_many([spec], output_width=output_width, max_workers=1, cache=cache)[0]
+    if result["error"]:
+        raise RuntimeError(f"SVG 栅格化失败: {result['error'].splitlines()[0]}")
+    return result["out"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量 SVG → PNG 栅格化 (带缓存)")
+    parser.add_argument("svgs", nargs="*", help="SVG 文件")
+    parser.add_argument("-o", "--out-dir", help="输出目录 (默认与 SVG 同目录)")
+    parser.add_argument("-w", "--width", type=int, default=DEFAULT_WIDTH, help=f"输出宽度 px (默认 {DEFAULT_WIDTH})")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="进程数 (默认 CPU 核数)")
+    parser.add_argument("--no-cache", action="store_true", help="不读写 PNG 缓存")
+    parser.add_argument("--cache-stats", action="store_true", help="显示缓存统计")
+    parser.add_argument("--clear-cache", action="store_true", help="清空缓存")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        clear_cache()
+        print(f"🧹 已清空 {CACHE_DIR}")
+    if args.cache_stats:
+        s = cache_stats()
+        print(f"📦 {s['dir']}: {s['entries']} 个 PNG, "
+              f"{s['bytes'] / 1024 / 1024:.1f} / {s['max_bytes'] / 1024 / 1024:.0f} MB")
+    if not args.svgs:
+        if not (args.clear_cache or args.cache_stats):
+            parser.error("至少需要一个 SVG 文件")
+        return
+
+    results = rasterize_many(
+        args.svgs,
+        output_width=args.width,
+        out_dir=args.out_dir,
+        max_workers=args.jobs,
+        cache=not args.no_cache,
+        verbose=not args.quiet,
+    )
+    sys.exit(1 if any(r["error"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+SVG UI 模板渲染引擎 — 结构化数据 → 最终 SVG
+
+每个 assets/*.svg 只解析一次, 编译为 "字面量 / {{字段}} / 可平移的 x,y 坐标" 片段;
+重复块 (表格行、清单项、流水线节点、详情卡片) 作为布局区域, 按数据条数自动排布,
+后续内容整体下移, viewBox 高度自动计算。无需手工复制行块或改 viewBox, 输出确定。
+
+用法:
+    from render_svg import render, render_to_file
+
+    svg = render("checklist-panel", {
+        "title": "数据分析任务清单", "date": "2026-03-05",
+        "items": [
+            {"text": "数据清洗", "status": "done"},
+            {"text": "差异分析", "status": "in_progress"},
+            {"text": "通路富集", "status": "pending"},
+            {"text": "外部验证", "status": "blocked"},
+        ],
+        "notes": ["验证集待申请权限"],
+        "footer": "MedgeClaw",
+    })
+
+    render_to_file("pipeline-status", data, "/tmp/status.svg")
+
+命令行:
+    python3 render_svg.py checklist-panel data.json -o out.svg
+    cat data.json | python3 render_svg.py pipeline-status - -o out.svg
+
+数据格式 (标量字段: key 大写即占位符名, 如 "footer_note" → {{FOOTER_NOTE}}):
+    list-panel       columns: [4 列标题], rows: [[4 个单元格], ...]
+    checklist-panel  items: [{"text", "status"}], notes: [str]
+                     status: done / in_progress / pending / blocked
+                     DONE_COUNT / TOTAL_COUNT / PROGRESS_* 自动计算
+    pipeline-status  nodes: [{"name", "status", "owner", "duration", "deps",
+                     "output", "status_text"}]; status: done / active / pending / blocked
+                     每行最多 5 个节点; 含详情字段的节点生成详情卡片 (每行 3 个)
+    richtext-layout  section_1_lines: [≤5], section_2_lines: [≤4],
+                     metrics: [[label, value], ...≤4], images: [path 或 None, ...≤2]
+"""
+
+import base64
+import json
+import math
+import mimetypes
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+TEMPLATES = ["list-panel", "checklist-panel", "pipeline-status", "richtext-layout"]
+
+# {{FIELD}} 或可平移的坐标属性; rx / dx / refX 等不会被匹配 (\b 边界)
+_PART = re.compile(r'\{\{(\w+)\}\}|\b(cx|cy|x1|x2|y1|y2|x|y)="(-?\d+(?:\.\d+)?)"')
+_FIELD, _X, _Y = 0, 1, 2
+
+STATUS_ALIASES = {
+    "done": "done", "completed": "done", "已完成": "done",
+    "in_progress": "active", "active": "active", "running": "active", "进行中": "active",
+    "pending": "pending", "todo": "pending", "待办": "pending", "待启动": "pending",
+    "blocked": "blocked", "error": "blocked", "failed": "blocked", "阻塞": "blocked",
+}
+STATUS_LABELS = {"done": "已完成", "active": "进行中", "pending": "待启动", "blocked": "阻塞"}
+
+
+def _status(value) -> str:
+    status = STATUS_ALIASES.get(str(value or "pending").lower())
+    if status is None:
+        raise ValueError(f"未知状态 '{value}', 可选: {sorted(set(STATUS_ALIASES))}")
+    return status
+
+
+def _num(v: float) -> str:
+    return str(int(v)) if v == int(v) else f"{v:g}"
+
+
+def _esc(value) -> str:
+    return escape(str(value), {'"': "&quot;"})
+
+
+class Fragment:
+    """预切分的 SVG 片段: 字面量、{{字段}} 槽位和可平移的 x/y 坐标"""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, text: str):
+        parts, pos = [], 0
+        for m in _PART.finditer(text):
+            parts.append(text[pos:m.start()])
+            if m.group(1):
+                parts.append((_FIELD, m.group(1)))
+            else:
+                axis = _X if "x" in m.group(2) else _Y
+                parts.append((axis, m.group(2), float(m.group(3))))
+            pos = m.end()
+        parts.append(text[pos:])
+        self.parts = [p for p in parts if p != ""]
+
+    def render(self, fields: dict, dx: float = 0, dy: float = 0) -> str:
+        """fields 的值必须已转义; 缺失字段渲染为空"""
+        out = []
+        for p in self.parts:
+            if isinstance(p, str):
+                out.append(p)
+            elif p[0] == _FIELD:
+                out.append(fields.get(p[1], ""))
+            else:
+                out.append(f'{p[1]}="{_num(p[2] + (dx if p[0] == _X else dy))}"')
+        return "".join(out)
+
+
+class Grid:
+    """
+    重复块布局区域。
+
+    prototypes: {key: (Fragment, col, row)} — 原型在模板中所处的网格位置
+    第 i 个条目放在 (row=i//columns, col=i%columns); 区域高度随行数增减,
+    模板原有 rows 行, 多出/少掉的行数 × ypitch 即后续内容的位移量。
+    """
+
+    def __init__(self, prototypes: dict, columns: int = 1, xpitch: float = 0,
+                 ypitch: float = 0, rows: int = 1):
+        self.prototypes = prototypes
+        self.columns = columns
+        self.xpitch = xpitch
+        self.ypitch = ypitch
+        self.rows = rows
+
+    def render(self, entries: list[list[tuple[str, dict]]], dy: float) -> tuple[str, float]:
+        """entries: 每个条目一组 (原型 key, 字段) — 同一位置可叠加多个原型 (如节点 + 箭头)"""
+        out = []
+        for i, group in enumerate(entries):
+            row, col = divmod(i, self.columns)
+            for key, fields in group:
+                frag, pcol, prow = self.prototypes[key]
+                out.append(frag.render(
+                    fields,
+                    dx=(col - pcol) * self.xpitch,
+                    dy=(row - prow) * self.ypitch + dy,
+                ))
+        used_rows = math.ceil(len(entries) / self.columns)
+        return "".join(out), (used_rows - self.rows) * self.ypitch
+
+
+class CompiledTemplate:
+    """编译后的模板: 静态片段与布局区域交替排列, 区域的高度变化向后累加"""
+
+    def __init__(self, name: str, height: float, pieces: list, prepare):
+        self.name = name
+        self.height = height
+        self.pieces = pieces      # Fragment 或 (区域名, Grid)
+        self.prepare = prepare    # data -> (额外字段, {区域名: entries})
+
+    def render(self, data: dict) -> str:
+        fields = {
+            k.upper(): _esc(v) for k, v in data.items()
+            if isinstance(v, (str, int, float)) and not isinstance(v, bool)
+        }
+        extra_fields, regions = self.prepare(data)
+        fields.update({k: _esc(v) for k, v in extra_fields.items()})
+
+        body, dy = [], 0.0
+        for piece in self.pieces[1:]:
+            if isinstance(piece, Fragment):
+                body.append(piece.render(fields, dy=dy))
+            else:
+                region_name, grid = piece
+                svg, extra = grid.render(regions.get(region_name, []), dy)
+                body.append(svg)
+                dy += extra
+        fields["_HEIGHT"] = _num(self.height + dy)
+        return self.pieces[0].render(fields) + "".join(body)
+
+
+# ─── 模板解析 ──────────────────────────────────────────────────────────
+
+
+def _split_at(text: str, markers: list[str]) -> list[str]:
+    """按标记所在行的行首切分, 返回 len(markers)+1 段"""
+    cuts = []
+    for marker in markers:
+        idx = text.index(marker, cuts[-1] if cuts else 0)
+        cuts.append(text.rfind("\n", 0, idx) + 1)
+    bounds = [0] + cuts + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def _head(text: str) -> tuple[Fragment, float]:
+    """模板开头: viewBox 与背景矩形高度改为 {{_HEIGHT}} 槽位"""
+    height = float(re.search(r'viewBox="0 0 \d+ (\d+)"', text).group(1))
+    h = _num(height)
+    text = text.replace(f'viewBox="0 0 1200 {h}"', 'viewBox="0 0 1200 {{_HEIGHT}}"', 1)
+    text = text.replace(f'<rect width="1200" height="{h}"', '<rect width="1200" height="{{_HEIGHT}}"', 1)
+    return Fragment(text), height
+
+
+def _recolor(text: str, mapping: dict) -> str:
+    for old, new in mapping.items():
+        text = text.replace(old, new)
+    return text
+
+
+def _compile_list_panel(text: str) -> CompiledTemplate:
+    head, _, row1, row2, _, tail = _split_at(text, [
+        "<!-- Row template", "<!-- Row 1 -->", "<!-- Row 2 -->", "<!-- Row 3 -->", "<!-- Summary footer -->",
+    ])
+    head, height = _head(head)
+
+    def row_proto(block: str) -> Fragment:
+        block = re.sub(r"\{\{ROW_\d+_COL_(\d+)\}\}", r"{{CELL_\1}}", block)
+        block = re.sub(r'(font-size="13">)\d+(</text>)', r"\1{{N}}\2", block, count=1)
+        return Fragment(block)
+
+    rows = Grid({"odd": (row_proto(row1), 0, 0), "even": (row_proto(row2), 0, 1)}, ypitch=56, rows=5)
+
+    def prepare(data):
+        fields = {f"COL_{i + 1}": c for i, c in enumerate(data.get("columns", []))}
+        entries = []
+        for i, row in enumerate(data.get("rows", [])):
+            cells = {f"CELL_{j + 1}": _esc(c) for j, c in enumerate(row)}
+            cells["N"] = str(i + 1)
+            entries.append([("odd" if i % 2 == 0 else "even", cells)])
+        return fields, {"rows": entries}
+
+    return CompiledTemplate("list-panel", height, [head, ("rows", rows), Fragment(tail)], prepare)
+
+
+def _compile_checklist_panel(text: str) -> CompiledTemplate:
+    head, done, _, active, pending, _, blocked, notes_hdr, note1, _, tail = _split_at(text, [
+        "<!-- Item 1: Done -->", "<!-- Item 2: Done -->", "<!-- Item 3: In progress -->",
+        "<!-- Item 4: Pending -->", "<!-- Item 5: Pending -->", "<!-- Item 6: Blocked -->",
+        "<!-- Notes area -->", "{{NOTE_1}}", "{{NOTE_2}}", "<!-- Footer -->",
+    ])
+    head, height = _head(head)
+
+    def item_proto(block: str) -> Fragment:
+        return Fragment(re.sub(r"\{\{ITEM_\d+\}\}", "{{TEXT}}", block))
+
+    items = Grid({
+        "done": (item_proto(done), 0, 0),
+        "active": (item_proto(active), 0, 2),
+        "pending": (item_proto(pending), 0, 3),
+        "blocked": (item_proto(blocked), 0, 5),
+    }, ypitch=60, rows=6)
+    notes = Grid({"note": (Fragment(note1.replace("{{NOTE_1}}", "{{TEXT}}")), 0, 0)}, ypitch=20, rows=2)
+
+    def prepare(data):
+        items_data = data.get("items", [])
+        statuses = [_status(it.get("status")) for it in items_data]
+        total = len(items_data)
+        done_count = statuses.count("done")
+        ratio = done_count / total if total else 0.0
+        fields = {
+            "DONE_COUNT": data.get("done_count", done_count),
+            "TOTAL_COUNT": data.get("total_count", total),
+            "PROGRESS_WIDTH": _num(round(500 * ratio, 1)),
+            "PROGRESS_PERCENT": data.get("progress_percent", round(100 * ratio)),
+        }
+        entries = [[(s, {"TEXT": _esc(it.get("text", ""))})] for s, it in zip(statuses, items_data)]
+        note_entries = [[("note", {"TEXT": _esc(n)})] for n in data.get("notes", [])]
+        return fields, {"items": entries, "notes": note_entries}
+
+    pieces = [head, ("items", items), Fragment(notes_hdr), ("notes", notes), Fragment(tail)]
+    return CompiledTemplate("checklist-panel", height, pieces, prepare)
+
+
+_DETAIL_KEYS = ("owner", "duration", "deps", "output", "status_text")
+
+
+def _compile_pipeline_status(text: str) -> CompiledTemplate:
+    (head, node_done, arrow_done, _, arrow_active, node_active, arrow_pending, node_pending, _,
+     section, card_done, card_active, card_pending, tail) = _split_at(text, [
+        "<!-- Node 1: Done -->", "<!-- Arrow 1→2 -->", "<!-- Node 2: Done -->", "<!-- Arrow 2→3 -->",
+        "<!-- Node 3: Active -->", "<!-- Arrow 3→4 -->", "<!-- Node 4: Pending -->", "<!-- Arrow 4→5 -->",
+        "<!-- ===== Dependency detail cards below", "<!-- Detail card 1 -->", "<!-- Detail card 2 -->",
+        "<!-- Detail card 3 -->", "<!-- Risk / blockers bar -->",
+    ])
+    head, height = _head(head)
+
+    def proto(block: str) -> str:
+        block = re.sub(r"\{\{NODE_\d+_(\w+)\}\}", r"{{\1}}", block)
+        block = re.sub(r"\{\{NODE_\d+\}\}", "{{NAME}}", block)
+        return re.sub(r"(font-size=\"11\">)[^<]*(</text>)", r"\1{{LABEL}}\2", block)
+
+    node_blocked = _recolor(proto(node_pending), {
+        "#ECEFF1": "#FFEBEE", "#90A4AE": "#E53935", "#546E7A": "#C62828",
+    })
+    nodes = Grid({
+        "node_done": (Fragment(proto(node_done)), 0, 0),
+        "node_active": (Fragment(proto(node_active)), 2, 0),
+        "node_pending": (Fragment(proto(node_pending)), 3, 0),
+        "node_blocked": (Fragment(node_blocked), 3, 0),
+        # 箭头指向其所在列的节点, 颜色取决于目标节点状态
+        "arrow_done": (Fragment(arrow_done), 1, 0),
+        "arrow_active": (Fragment(arrow_active), 2, 0),
+        "arrow_pending": (Fragment(arrow_pending), 3, 0),
+    }, columns=5, xpitch=240, ypitch=110, rows=1)
+
+    card_pending = card_pending.replace('width="360"', 'width="350"')
+    cards = Grid({
+        "done": (Fragment(proto(card_done)), 0, 0),
+        "active": (Fragment(proto(card_active)), 1, 0),
+        "pending": (Fragment(proto(card_pending)), 2, 0),
+        "blocked": (Fragment(_recolor(proto(card_pending), {"#ECEFF1": "#FFEBEE", "#546E7A": "#C62828"})), 2, 0),
+    }, columns=3, xpitch=380, ypitch=200, rows=1)
+
+    def prepare(data):
+        node_entries, card_entries = [], []
+        for i, node in enumerate(data.get("nodes", [])):
+            status = _status(node.get("status"))
+            label = {"done": "✓ ", "active": "◐ ", "blocked": "✕ "}.get(status, "") + STATUS_LABELS[status]
+            f = {
+                "NAME": _esc(node.get("name", "")),
+                "LABEL": _esc(node.get("label") or label),
+                "OWNER": _esc(node.get("owner") or "—"),
+                "DURATION": _esc(node.get("duration") or "—"),
+                "DEPS": _esc(node.get("deps") or "—"),
+                "OUTPUT": _esc(node.get("output") or "—"),
+                "STATUS": _esc(node.get("status_text") or STATUS_LABELS[status]),
+            }
+            group = []
+            if i % 5:
+                group.append(("arrow_" + ("pending" if status == "blocked" else status), {}))
+            group.append(("node_" + status, f))
+            node_entries.append(group)
+            if any(node.get(k) for k in _DETAIL_KEYS):
+                card_entries.append([(status, f)])
+        return {}, {"nodes": node_entries, "cards": card_entries}
+
+    pieces = [head, ("nodes", nodes), Fragment(section), ("cards", cards), Fragment(tail)]
+    return CompiledTemplate("pipeline-status", height, pieces, prepare)
+
+
+def _image_slot(block: str, clip_id: str) -> Grid:
+    """图片占位区: 有图时保留阴影底框并叠加 <image>, 无图时保持原占位"""
+    rect = re.search(r"<rect [^>]*/>", block).group(0)
+    attrs = dict(re.findall(r'(\w+)="([^"]*)"', rect))
+    image = (
+        f'  {rect}\n'
+        f'  <image x="{attrs["x"]}" y="{attrs["y"]}" width="{attrs["width"]}" height="{attrs["height"]}" '
+        f'href="{{{{HREF}}}}" clip-path="url(#{clip_id})" preserveAspectRatio="xMidYMid slice"/>\n\n'
+    )
+    return Grid({"placeholder": (Fragment(block), 0, 0), "image": (Fragment(image), 0, 0)})
+
+
+def _data_uri(path) -> str:
+    s = str(path)
+    if s.startswith(("data:", "http://", "https://")):
+        return s
+    mime = mimetypes.guess_type(s)[0] or "image/png"
+    return f"data:{mime};base64,{base64.b64encode(Path(s).read_bytes()).decode()}"
+
+
+def _compile_richtext_layout(text: str) -> CompiledTemplate:
+    head, img1, middle, img2, tail = _split_at(text, [
+        "<!-- ===== Left column: Image area 1", "<!-- Image 1 caption -->",
+        "<!-- Image area 2 (bottom-right) -->", "<!-- Footer -->",
+    ])
+    head, height = _head(head)
+
+    def prepare(data):
+        fields = {}
+        for section, limit in (("SECTION_1", 5), ("SECTION_2", 4)):
+            for i, line in enumerate(data.get(f"{section.lower()}_lines", [])[:limit]):
+                fields[f"{section}_LINE_{i + 1}"] = line
+        for i, (label, value) in enumerate(data.get("metrics", [])[:4]):
+            fields[f"METRIC_{i + 1}_LABEL"] = label
+            fields[f"METRIC_{i + 1}_VALUE"] = value
+        slots = {}
+        images = data.get("images", [])
+        for i in range(2):
+            src = images[i] if i < len(images) else None
+            placeholder = data.get(f"image_{i + 1}_placeholder", "")
+            slots[f"image_{i + 1}"] = [[
+                ("image", {"HREF": _esc(_data_uri(src))}) if src
+                else ("placeholder", {f"IMAGE_{i + 1}_PLACEHOLDER": _esc(placeholder)})
+            ]]
+        return fields, slots
+
+    pieces = [
+        head, ("image_1", _image_slot(img1, "imgClip1")), Fragment(middle),
+        ("image_2", _image_slot(img2, "imgClip2")), Fragment(tail),
+    ]
+    return CompiledTemplate("richtext-layout", height, pieces, prepare)
+
+
+_COMPILERS = {
+    "list-panel": _compile_list_panel,
+    "checklist-panel": _compile_checklist_panel,
+    "pipeline-status": _compile_pipeline_status,
+    "richtext-layout": _compile_richtext_layout,
+}
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str, assets_dir: str = str(ASSETS_DIR)) -> CompiledTemplate:
+    """解析并编译 assets/<name>.svg (每个进程每个模板只做一次)"""
+    if name not in _COMPILERS:
+        raise ValueError(f"未知模板 '{name}', 可选: {TEMPLATES}")
+    text = (Path(assets_dir) / f"{name}.svg").read_text(encoding="utf-8")
+    return _COMPILERS[name](text)
+
+
+def render(name: str, data: dict) -> str:
+    """用结构化数据渲染模板, 返回 SVG 字符串"""
+    return load_template(name).render(data)
+
+
+def render_to_file(name: str, data: dict, out_path: str) -> str:
+    """渲染并写入文件, 返回输出路径"""
+    Path(out_path).write_text(render(name, data), encoding="utf-8")
+    return out_path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render SVG UI template from JSON data")
+    parser.add_argument("template", choices=TEMPLATES)
+    parser.add_argument("data", help="JSON 数据文件, '-' 表示 stdin")
+    parser.add_argument("-o", "--out", help="输出 SVG 路径 (默认 stdout)")
+    args = parser.parse_args()
+
+    raw = sys.stdin.read() if args.data == "-" else Path(args.data).read_text(encoding="utf-8")
+    svg = render(args.template, json.loads(raw))
+    if args.out:
+        Path(args.out).write_text(svg, encoding="utf-8")
+        print(f"✅ {args.template} → {args.out}", file=sys.stderr)
+    else:
+        sys.stdout.write(svg)
+
+
+if __name__ == "__main__":
+    main()